@@ -0,0 +1,269 @@
+"""
+A generic multi-state cellular automaton engine.
+
+The functions in functions.py bake in a single behavior: Moore or von Neumann
+neighborhoods of radius 1, and off-board cells that read as state 0. An
+Automaton is instead parametrized by
+
+    neighborhood: "Moore" or "vonNeumann" with any radius, or a custom list of (dr, dc) offsets
+    num_states:   the number of cell states k
+    boundary:     "fixed" (off-board cells hold fixed_state), "toroidal" (the board wraps
+                  around), or "reflecting" (the board is mirrored at its edges)
+
+and a transition, given either as a rule table from compile_rules() or as a
+function that maps the stacked neighborhoods of all cells to their next states.
+
+For every board shape, the engine works out once which cell each neighbor of
+each cell is (taking the boundary into account) and stores this as an index
+array. A generation is then a single gather from the board through that
+array, followed by one table lookup or one call to the rule function.
+"""
+
+from collections.abc import Callable
+import numpy as np
+from datatypes import GameBoard
+from fast_engine import NEIGHBORHOOD_OFFSETS
+
+BOUNDARY_MODES = ("fixed", "toroidal", "reflecting")
+
+
+def neighborhood_offsets(neighborhood_type: str, radius: int = 1) -> list[tuple[int, int]]:
+    """
+    List the neighbor offsets of a Moore or von Neumann neighborhood of a given radius.
+
+    Args:
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        radius (int): Neighborhood radius (>= 1).
+
+    Returns:
+        list[tuple[int, int]]: (dr, dc) offsets, not including the center. For radius 1 these
+        are in the same order as neighborhood_to_string(), so rule tables carry over;
+        otherwise they are in row-major order.
+    """
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+    if not isinstance(radius, int) or radius < 1:
+        raise ValueError("radius must be a positive integer.")
+
+    if radius == 1:
+        return list(NEIGHBORHOOD_OFFSETS[neighborhood_type])
+
+    offsets = []
+    for dr in range(-radius, radius + 1):
+        for dc in range(-radius, radius + 1):
+            if dr == 0 and dc == 0:
+                continue
+            if neighborhood_type == "Moore" or abs(dr) + abs(dc) <= radius:
+                offsets.append((dr, dc))
+
+    return offsets
+
+
+def outer_totalistic_rule(birth: set[int], survive: set[int]) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Make a two-state rule function that depends only on the center and its number of live neighbors.
+
+    With a radius 1 Moore neighborhood, birth={3} and survive={2, 3} is the Game of Life.
+
+    Args:
+        birth (set[int]): Live-neighbor counts at which a dead cell becomes alive.
+        survive (set[int]): Live-neighbor counts at which a live cell stays alive.
+
+    Returns:
+        Callable[[np.ndarray], np.ndarray]: A rule function for Automaton.
+    """
+    birth_counts = np.array(sorted(birth), dtype=np.int64)
+    survive_counts = np.array(sorted(survive), dtype=np.int64)
+
+    def rule(neighborhoods: np.ndarray) -> np.ndarray:
+        alive = neighborhoods[0] != 0
+        count = np.count_nonzero(neighborhoods[1:], axis=0)
+        born = ~alive & np.isin(count, birth_counts)
+        stays = alive & np.isin(count, survive_counts)
+        return (born | stays).astype(np.uint8)
+
+    return rule
+
+
+class Automaton:
+    """
+    A cellular automaton with a configurable neighborhood, number of states and boundary.
+    """
+
+    def __init__(self,
+                 neighborhood: str | list[tuple[int, int]] = "Moore",
+                 num_states: int = 2,
+                 boundary: str = "fixed",
+                 radius: int = 1,
+                 fixed_state: int = 0,
+                 table: np.ndarray | None = None,
+                 rule: Callable[[np.ndarray], np.ndarray] | None = None):
+        """
+        Args:
+            neighborhood: "Moore", "vonNeumann", or a list of (dr, dc) neighbor offsets.
+            num_states (int): Number of cell states k.
+            boundary (str): "fixed", "toroidal", or "reflecting".
+            radius (int): Radius of a named neighborhood.
+            fixed_state (int): State of off-board cells when boundary is "fixed".
+            table (np.ndarray | None): Rule table of length k^n from compile_rules(), where n
+                counts the center and the neighbors, in order.
+            rule: Function taking an array of shape (n, num_rows, num_cols), whose first
+                slice is the center cells and the rest are their neighbors in order, and
+                returning the next states as a (num_rows, num_cols) array.
+        """
+        if isinstance(neighborhood, str):
+            offsets = neighborhood_offsets(neighborhood, radius)
+        else:
+            offsets = [(int(dr), int(dc)) for dr, dc in neighborhood]
+            if len(offsets) == 0 or (0, 0) in offsets:
+                raise ValueError("a custom neighborhood needs at least one offset and must not include (0, 0).")
+
+        if not isinstance(num_states, int) or num_states < 2:
+            raise ValueError("num_states must be an integer of at least 2.")
+        if boundary not in BOUNDARY_MODES:
+            raise ValueError('boundary must be "fixed", "toroidal", or "reflecting".')
+        if not isinstance(fixed_state, int) or not 0 <= fixed_state < num_states:
+            raise ValueError("fixed_state must be one of the num_states states.")
+        if (table is None) == (rule is None):
+            raise ValueError("exactly one of table and rule must be given.")
+        if table is not None and len(table) != num_states ** (len(offsets) + 1):
+            raise ValueError("table must have num_states ** (number of neighbors + 1) entries.")
+
+        self.offsets = offsets
+        self.num_states = num_states
+        self.boundary = boundary
+        self.fixed_state = fixed_state
+        self.table = table
+        self.rule = rule
+
+        # board shape -> (n, num_rows * num_cols) array of neighbor indices
+        self._index_cache: dict[tuple[int, int], np.ndarray] = {}
+
+    def neighbor_indices(self, num_rows: int, num_cols: int) -> np.ndarray:
+        """
+        Work out, for every cell, the flat index of the center and each of its neighbors.
+
+        The indices point into the flattened board with one extra entry at the end
+        (index num_rows * num_cols) that holds fixed_state, which is where off-board
+        neighbors point under the "fixed" boundary. The result is cached per board shape.
+
+        Returns:
+            np.ndarray: int64 array of shape (n, num_rows * num_cols).
+        """
+        shape = (num_rows, num_cols)
+        if shape in self._index_cache:
+            return self._index_cache[shape]
+
+        rows, cols = np.indices(shape)
+        rows = rows.ravel()
+        cols = cols.ravel()
+
+        indices = np.empty((len(self.offsets) + 1, num_rows * num_cols), dtype=np.int64)
+        indices[0] = rows * num_cols + cols
+
+        for i, (dr, dc) in enumerate(self.offsets):
+            r = rows + dr
+            c = cols + dc
+            if self.boundary == "toroidal":
+                indices[i + 1] = (r % num_rows) * num_cols + (c % num_cols)
+            elif self.boundary == "reflecting":
+                indices[i + 1] = _reflect(r, num_rows) * num_cols + _reflect(c, num_cols)
+            else:
+                on_board = (r >= 0) & (r < num_rows) & (c >= 0) & (c < num_cols)
+                indices[i + 1] = np.where(on_board, r * num_cols + c, num_rows * num_cols)
+
+        self._index_cache[shape] = indices
+        return indices
+
+    def step(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Advance a board array by one generation.
+
+        Args:
+            cells (np.ndarray): 2D integer array of states in range(num_states).
+
+        Returns:
+            np.ndarray: The next generation, with the same shape.
+        """
+        if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+            raise ValueError("cells must be a non-empty 2D NumPy array.")
+
+        num_rows, num_cols = cells.shape
+        indices = self.neighbor_indices(num_rows, num_cols)
+
+        extended = np.empty(num_rows * num_cols + 1, dtype=np.int64)
+        extended[:-1] = cells.ravel()
+        extended[-1] = self.fixed_state
+
+        # one gather collects every cell's whole neighborhood
+        neighborhoods = extended[indices]
+
+        if self.table is not None:
+            code = neighborhoods[0].copy()
+            for i in range(1, len(neighborhoods)):
+                code *= self.num_states
+                code += neighborhoods[i]
+            next_cells = self.table[code]
+        else:
+            next_cells = np.asarray(self.rule(neighborhoods.reshape(-1, num_rows, num_cols)))
+
+        return next_cells.reshape(num_rows, num_cols)
+
+    def run(self, initial_cells: np.ndarray, num_gens: int) -> list[np.ndarray]:
+        """
+        Simulate the automaton for a given number of generations.
+
+        Args:
+            initial_cells (np.ndarray): Starting board as a 2D integer array.
+            num_gens (int): Number of generations to simulate (>= 0).
+
+        Returns:
+            list[np.ndarray]: Boards from the initial one through generation num_gens.
+        """
+        if not isinstance(num_gens, int) or num_gens < 0:
+            raise ValueError("num_gens must be a non-negative integer.")
+
+        initial_cells = np.asarray(initial_cells)
+        if initial_cells.min() < 0 or initial_cells.max() >= self.num_states:
+            raise ValueError("initial_cells must only contain states in range(num_states).")
+
+        boards = [initial_cells.copy()]
+        for i in range(num_gens):
+            boards.append(self.step(boards[i]))
+
+        return boards
+
+
+def _reflect(x: np.ndarray, size: int) -> np.ndarray:
+    """
+    Mirror coordinates back onto range(size): -1 maps to 0, size maps to size - 1, and so on.
+    """
+    x = x % (2 * size)
+    return np.where(x < size, x, 2 * size - 1 - x)
+
+
+def play_automaton_generic(initial_board: GameBoard, num_gens: int,
+                           automaton: Automaton) -> list[GameBoard]:
+    """
+    Simulate an Automaton on a GameBoard, returning GameBoards for the drawing code.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        automaton: The Automaton to run.
+
+    Returns:
+        A list of GameBoards of length num_gens + 1.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    first_row_length = len(initial_board[0])
+    for row in initial_board:
+        if len(row) != first_row_length:
+            raise ValueError("Error: GameBoard is not rectangular.")
+
+    boards = []
+    for board in automaton.run(np.array(initial_board, dtype=np.int64), num_gens):
+        boards.append(board.tolist())
+
+    return boards
@@ -0,0 +1,215 @@
+"""
+A memoized block-update engine for cellular automata.
+
+A generation of a radius 1 automaton decides the next state of a b x b block of
+cells from the (b + 2) x (b + 2) block around it alone. Boards with large quiet
+regions, or with repeating structures such as the sheaths of Langton's loops,
+contain the same padded blocks over and over, both within one generation and
+from one generation to the next.
+
+A BlockMemoEngine cuts the board into b x b blocks (4 x 4 by default), and for
+every generation:
+
+    1. gathers the padded context of every block,
+    2. finds the distinct contexts with np.unique,
+    3. looks each one up in a dictionary from context bytes to next-state block,
+    4. computes the misses together with the compiled rule table, and
+    5. scatters the results back into the board.
+
+The dictionary is an LRU cache capped at max_entries blocks, so memory stays
+bounded however many distinct contexts a run goes through. The stats tell us
+whether memoizing pays off: a high hit rate means most of the board was looked
+up rather than computed.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from datatypes import GameBoard, RuleTable, BlockCacheStats
+from fast_engine import NEIGHBORHOOD_OFFSETS, compile_rules
+
+
+class BlockMemoEngine:
+    """
+    Advance boards block by block, remembering the next state of every padded block it has seen.
+    """
+
+    def __init__(self, rule_table: RuleTable, block_size: int = 4, max_entries: int = 1 << 16):
+        """
+        Args:
+            rule_table (RuleTable): Compiled rules, e.g. from read_compiled_rules().
+            block_size (int): Width b of the square blocks that are memoized.
+            max_entries (int): Largest number of blocks to keep in the cache.
+        """
+        if not isinstance(rule_table, RuleTable):
+            raise ValueError("rule_table must be a RuleTable.")
+        if rule_table.num_states > 256:
+            raise ValueError("BlockMemoEngine only supports up to 256 states.")
+        if not isinstance(block_size, int) or block_size < 1:
+            raise ValueError("block_size must be a positive integer.")
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+
+        self.rule_table = rule_table
+        self.block_size = block_size
+        self.max_entries = max_entries
+        self.stats = BlockCacheStats()
+
+        # context bytes -> b x b next-state block, least recently used first
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset the stats.
+        """
+        self._cache.clear()
+        self.stats = BlockCacheStats()
+
+    def step(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Advance a board array by one generation.
+
+        Args:
+            cells (np.ndarray): 2D integer array of states in range(num_states).
+
+        Returns:
+            np.ndarray: The next generation as a uint8 array of the same shape.
+        """
+        if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+            raise ValueError("cells must be a non-empty 2D NumPy array.")
+        if cells.min() < 0 or cells.max() >= self.rule_table.num_states:
+            raise ValueError("board contains states that the rule table does not cover.")
+
+        b = self.block_size
+        num_rows, num_cols = cells.shape
+        block_rows = -(-num_rows // b)
+        block_cols = -(-num_cols // b)
+
+        # off-board cells, including those rounding the board up to whole blocks, are 0
+        padded = np.zeros((block_rows * b + 2, block_cols * b + 2), dtype=np.uint8)
+        padded[1:num_rows + 1, 1:num_cols + 1] = cells
+
+        # the (b + 2) x (b + 2) context of every block, one row of bytes per block
+        windows = sliding_window_view(padded, (b + 2, b + 2))[::b, ::b]
+        contexts = np.ascontiguousarray(windows.reshape(block_rows * block_cols, (b + 2) * (b + 2)))
+
+        keys = contexts.view(np.dtype((np.void, contexts.shape[1]))).ravel()
+        unique_keys, first, inverse, counts = np.unique(keys, return_index=True,
+                                                        return_inverse=True, return_counts=True)
+
+        results = np.empty((len(unique_keys), b, b), dtype=np.uint8)
+        missing = []
+        for i, key in enumerate(unique_keys.tolist()):
+            block = self._cache.get(key)
+            if block is None:
+                missing.append(i)
+                # the first occurrence is computed, the rest of this generation reuses it
+                self.stats.misses += 1
+                self.stats.hits += int(counts[i]) - 1
+            else:
+                self._cache.move_to_end(key)
+                results[i] = block
+                self.stats.hits += int(counts[i])
+
+        if len(missing) > 0:
+            missing = np.array(missing)
+            computed = self._compute_blocks(contexts[first[missing]].reshape(-1, b + 2, b + 2))
+            results[missing] = computed
+            for i, block in zip(missing.tolist(), computed):
+                self._cache[unique_keys[i].tobytes()] = block
+
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self.stats.evictions += 1
+
+        self.stats.size = len(self._cache)
+
+        # put every block's result back in its place on the board
+        board = results[inverse.ravel()].reshape(block_rows, block_cols, b, b)
+        board = board.transpose(0, 2, 1, 3).reshape(block_rows * b, block_cols * b)
+
+        return board[:num_rows, :num_cols].copy()
+
+    def run(self, initial_cells: np.ndarray, num_gens: int) -> list[np.ndarray]:
+        """
+        Simulate the automaton for a given number of generations.
+
+        Args:
+            initial_cells (np.ndarray): Starting board as a 2D integer array.
+            num_gens (int): Number of generations to simulate (>= 0).
+
+        Returns:
+            list[np.ndarray]: Boards from the initial one through generation num_gens.
+        """
+        if not isinstance(num_gens, int) or num_gens < 0:
+            raise ValueError("num_gens must be a non-negative integer.")
+
+        boards = [np.asarray(initial_cells).astype(np.uint8)]
+        for i in range(num_gens):
+            boards.append(self.step(boards[i]))
+
+        return boards
+
+    def _compute_blocks(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Compute the next state of the inner b x b cells of a stack of (b + 2) x (b + 2) contexts.
+        """
+        b = self.block_size
+        k = self.rule_table.num_states
+
+        # the same base-k encoding as encode_neighborhoods(), over the whole stack at once
+        index = contexts[:, 1:-1, 1:-1].astype(np.int64)
+        for dr, dc in NEIGHBORHOOD_OFFSETS[self.rule_table.neighborhood_type]:
+            index *= k
+            index += contexts[:, 1 + dr:1 + dr + b, 1 + dc:1 + dc + b]
+
+        return self.rule_table.table[index].astype(np.uint8)
+
+
+def play_automaton_memoized(initial_board: GameBoard, num_gens: int,
+                            neighborhood_type: str,
+                            rules: dict[str, int] | RuleTable,
+                            block_size: int = 4,
+                            max_entries: int = 1 << 16) -> tuple[list[GameBoard], BlockCacheStats]:
+    """
+    Simulate an automaton with a BlockMemoEngine.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer, or a compiled RuleTable.
+        block_size: Width of the memoized blocks.
+        max_entries: Largest number of blocks to keep in the cache.
+
+    Returns:
+        The boards (a list of GameBoards of length num_gens + 1), and the cache stats of the run.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    first_row_length = len(initial_board[0])
+    for row in initial_board:
+        if len(row) != first_row_length:
+            raise ValueError("Error: GameBoard is not rectangular.")
+
+    cells = np.array(initial_board, dtype=np.int64)
+    if cells.min() < 0:
+        raise ValueError("initial_board must only contain non-negative states.")
+
+    if isinstance(rules, RuleTable):
+        if rules.neighborhood_type != neighborhood_type:
+            raise ValueError("rules were compiled for a " + rules.neighborhood_type + " neighborhood.")
+        rule_table = rules
+    else:
+        table = compile_rules(rules, neighborhood_type, min_states=int(cells.max()) + 1)
+        n = len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1
+        num_states = int(round(len(table) ** (1.0 / n)))
+        rule_table = RuleTable(neighborhood_type, num_states, table, np.ones(len(table), dtype=bool))
+
+    engine = BlockMemoEngine(rule_table, block_size, max_entries)
+
+    boards = []
+    for board in engine.run(cells, num_gens):
+        boards.append(board.tolist())
+
+    return boards, engine.stats
@@ -1,4 +1,24 @@
-from datatypes import GameBoard
+import hashlib
+import zipfile
+import os
+import numpy as np
+from datatypes import GameBoard, RuleTable
+from fast_engine import NEIGHBORHOOD_OFFSETS, compile_rules
+
+# bump this whenever the cached table format or the compilation changes
+RULE_CACHE_VERSION = 1
+
+# how the outer ring of a neighborhood string (everything after the center) is permuted
+# by a quarter turn and by a left-right mirror, for each neighborhood type
+RING_ROTATION = {
+    "Moore": [6, 7, 0, 1, 2, 3, 4, 5],
+    "vonNeumann": [3, 0, 1, 2],
+}
+RING_REFLECTION = {
+    "Moore": [2, 1, 0, 7, 6, 5, 4, 3],
+    "vonNeumann": [0, 3, 2, 1],
+}
+SYMMETRIES = ("none", "rotate4", "rotate4reflect")
 
 def read_board_from_file(filename: str) -> GameBoard:
     """
@@ -71,4 +91,193 @@ def read_rules_from_file(filename: str) -> dict[str, int]:
         # add current rule to dictionary 
         rules[neighborhood_string] = new_state
 
-    return rules
\ No newline at end of file
+    return rules
+
+
+def read_compiled_rules(filename: str, neighborhood_type: str, symmetry: str = "none",
+                        default_state: int | None = 0, cache_dir: str | None = None) -> RuleTable:
+    """
+    Read a rule file and compile it into a validated RuleTable, caching the result on disk.
+
+    Unlike read_rules_from_file(), a neighborhood that appears twice with different
+    next states is an error rather than silently taking the last value. With a
+    symmetry other than "none", every rule also stands for the rotated (and, for
+    "rotate4reflect", mirrored) copies of its neighborhood, so symmetric rule sets
+    such as Langton's loops only need to list one of each.
+
+    The compiled table is saved in cache_dir under the SHA-256 of the rule file's
+    contents and the compilation options, so loading the same file again skips
+    parsing altogether.
+
+    Args:
+        filename (str): Rule file, with one <neighborhood>:<next_state> rule per line.
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        symmetry (str): "none", "rotate4", or "rotate4reflect".
+        default_state (int | None): Next state for neighborhoods without a rule; None keeps
+            the cell's current state.
+        cache_dir (str | None): Directory for cached tables; defaults to a .rule_cache folder
+            next to the rule file.
+
+    Returns:
+        RuleTable: The compiled rule set.
+    """
+    if not isinstance(filename, str) or len(filename) == 0:
+        raise ValueError("filename must be a non-empty string.")
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+    if symmetry not in SYMMETRIES:
+        raise ValueError('symmetry must be "none", "rotate4", or "rotate4reflect".')
+
+    with open(filename, "rb") as file:
+        contents = file.read()
+
+    # the cache key covers everything that changes the compiled table
+    key = hashlib.sha256(contents)
+    key.update((str(RULE_CACHE_VERSION) + ":" + neighborhood_type + ":" + symmetry + ":" + str(default_state)).encode())
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filename)), ".rule_cache")
+    cache_path = os.path.join(cache_dir, key.hexdigest() + ".npz")
+
+    rule_table = _load_cached_rules(cache_path, neighborhood_type)
+    if rule_table is not None:
+        return rule_table
+
+    rules = parse_rules(contents.decode("utf-8"), filename)
+    if symmetry != "none":
+        rules = expand_symmetric_rules(rules, neighborhood_type, symmetry == "rotate4reflect")
+
+    table = compile_rules(rules, neighborhood_type, default_state=default_state)
+    num_states = int(round(len(table) ** (1.0 / (len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1))))
+
+    # compile the rules once more, marking which entries they cover
+    defined = compile_rules({neighborhood: 1 for neighborhood in rules}, neighborhood_type,
+                            min_states=num_states).astype(bool)
+
+    rule_table = RuleTable(neighborhood_type, num_states, table, defined, default_state)
+
+    # a cache we cannot write to only costs us the speedup
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = cache_path + "." + str(os.getpid()) + ".tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(file, table=table, defined=np.packbits(defined),
+                     num_states=num_states,
+                     default_state=-1 if default_state is None else default_state)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+    return rule_table
+
+
+def parse_rules(text: str, source: str = "<rules>") -> dict[str, int]:
+    """
+    Parse rule lines of the form <neighborhood>:<next_state>, rejecting conflicting duplicates.
+
+    Blank lines are skipped. A neighborhood listed more than once is fine as long as
+    every copy gives the same next state.
+
+    Args:
+        text (str): The contents of a rule file.
+        source (str): Name to mention in error messages.
+
+    Returns:
+        dict[str, int]: mapping neighborhood-string -> next-state int
+    """
+    rules: dict[str, int] = {}
+    first_line: dict[str, int] = {}
+
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if len(line) == 0:
+            continue
+
+        parts = line.split(":")
+        if len(parts) != 2 or not parts[0].isdigit() or not parts[1].strip().isdigit():
+            raise ValueError(source + ", line " + str(line_number) + ": expected <neighborhood>:<next_state>, got " + line)
+
+        neighborhood = parts[0]
+        new_state = int(parts[1])
+
+        if neighborhood in rules and rules[neighborhood] != new_state:
+            raise ValueError(source + ", line " + str(line_number) + ": rule for " + neighborhood
+                             + " conflicts with line " + str(first_line[neighborhood]) + ".")
+
+        if neighborhood not in rules:
+            rules[neighborhood] = new_state
+            first_line[neighborhood] = line_number
+
+    if len(rules) == 0:
+        raise ValueError(source + " does not contain any rules.")
+
+    return rules
+
+
+def expand_symmetric_rules(rules: dict[str, int], neighborhood_type: str,
+                           reflect: bool = False) -> dict[str, int]:
+    """
+    Add the rotated (and optionally mirrored) copies of every rule's neighborhood.
+
+    Args:
+        rules (dict[str, int]): mapping neighborhood-string -> next-state int
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        reflect (bool): Also add left-right mirror images.
+
+    Returns:
+        dict[str, int]: The expanded rules. A copy that disagrees with another rule raises a ValueError.
+    """
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+
+    rotation = RING_ROTATION[neighborhood_type]
+    reflection = RING_REFLECTION[neighborhood_type]
+
+    expanded = dict(rules)
+    origin: dict[str, str] = {neighborhood: neighborhood for neighborhood in rules}
+
+    for neighborhood, new_state in rules.items():
+        center, ring = neighborhood[0], neighborhood[1:]
+        if len(ring) != len(rotation):
+            raise ValueError("Rule " + neighborhood + " is not a " + neighborhood_type + " neighborhood string.")
+
+        variants = []
+        for mirrored in ([False, True] if reflect else [False]):
+            current = "".join(ring[i] for i in reflection) if mirrored else ring
+            for _ in range(4):
+                variants.append(center + current)
+                current = "".join(current[i] for i in rotation)
+
+        for variant in variants:
+            if variant not in expanded:
+                expanded[variant] = new_state
+                origin[variant] = neighborhood
+            elif expanded[variant] != new_state:
+                raise ValueError("Rule " + neighborhood + " conflicts with rule " + origin[variant]
+                                 + " under " + neighborhood_type + " symmetry.")
+
+    return expanded
+
+
+def _load_cached_rules(cache_path: str, neighborhood_type: str) -> RuleTable | None:
+    """
+    Load a RuleTable written by read_compiled_rules(), or return None if there is no usable one.
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with np.load(cache_path) as cached:
+            table = cached["table"]
+            num_states = int(cached["num_states"])
+            default_state = int(cached["default_state"])
+            defined = np.unpackbits(cached["defined"], count=len(table)).astype(bool)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        # a damaged cache file is simply rebuilt
+        return None
+
+    if num_states ** (len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1) != len(table):
+        return None
+
+    return RuleTable(neighborhood_type, num_states, table, defined,
+                     None if default_state < 0 else default_state)
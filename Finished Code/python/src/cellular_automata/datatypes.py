@@ -1,3 +1,48 @@
+from dataclasses import dataclass
+import numpy as np
+
 # GameBoard is a two-dimensional list of integers
 # representing a single generation of a cellular automaton.
-GameBoard = list[list[int]]
\ No newline at end of file
+GameBoard = list[list[int]]
+
+
+@dataclass
+class RuleTable:
+    """
+    A rule set compiled into a dense lookup table (see compile_rules()).
+
+    table[i] is the next state of a cell whose neighborhood encodes to i, and
+    defined[i] records whether that entry came from an actual rule or was
+    filled in with the default: default_state, or the cell's current state
+    if default_state is None.
+    """
+    neighborhood_type: str
+    num_states: int
+    table: np.ndarray
+    defined: np.ndarray
+    default_state: int | None = 0
+
+
+@dataclass
+class BlockCacheStats:
+    """
+    Counters for the block cache of a BlockMemoEngine.
+
+    Every block of every generation is one lookup: a hit if its next state was
+    already known (from an earlier generation, or from an identical block earlier
+    in the same generation), and a miss if it had to be computed.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        if self.lookups == 0:
+            return 0.0
+        return self.hits / self.lookups
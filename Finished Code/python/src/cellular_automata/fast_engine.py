@@ -0,0 +1,249 @@
+"""
+A vectorized cellular automaton engine driven by a compiled rule table.
+
+update_cell() builds a string for every cell with neighborhood_to_string() and
+looks it up in the rules dictionary, re-validating the whole board several
+times along the way. Here we do the lookup work once instead: compile_rules()
+turns the dict[str, int] into a dense integer table, where a neighborhood
+whose cells hold states d0 d1 ... d(n-1) (in the same order as in the rule
+strings) is stored at index
+
+    d0 * k^(n-1) + d1 * k^(n-2) + ... + d(n-1)
+
+for a k-state automaton. A whole generation is then computed with NumPy: we
+pad the board with the default 0 state (as neighborhood_to_string() does off
+the board), build every cell's index from shifted copies of the board, and
+gather all the new states from the table at once.
+"""
+
+import numpy as np
+from datatypes import GameBoard, RuleTable
+
+# offsets of the neighbors of (r, c), in the order that neighborhood_to_string() appends them
+NEIGHBORHOOD_OFFSETS = {
+    "Moore": [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)],
+    "vonNeumann": [(-1, 0), (0, 1), (1, 0), (0, -1)],
+}
+
+# refuse to build rule tables with more entries than this
+MAX_TABLE_SIZE = 1 << 26
+
+
+def compile_rules(rules: dict[str, int], neighborhood_type: str,
+                  min_states: int = 0, default_state: int | None = 0) -> np.ndarray:
+    """
+    Compile a rule dictionary into a dense lookup table.
+
+    Neighborhoods that have no rule map to default_state. The default of 0 is what
+    update_cell() returns for them; None keeps the cell's current state instead.
+
+    Args:
+        rules (dict[str, int]): A mapping from neighborhood strings to next-state integers.
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        min_states (int): Smallest number of cell states k to allow for, e.g. to cover
+            states that appear on a board but in no rule. k is always at least one
+            more than the largest state appearing in the rules.
+        default_state (int | None): Next state for neighborhoods without a rule.
+
+    Returns:
+        np.ndarray: 1D table of length k^n (n = neighborhood size, center included)
+        holding the next state for every encoded neighborhood.
+    """
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+    if not isinstance(rules, dict) or len(rules) == 0:
+        raise ValueError("rules must be a non-empty dict[str, int].")
+
+    n = len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1
+
+    # parse every rule into its list of digits first, checking it as we go
+    parsed = []
+    largest = 0
+    for neighborhood, new_state in rules.items():
+        if len(neighborhood) != n or not neighborhood.isdigit():
+            raise ValueError("Rule " + neighborhood + " is not a " + neighborhood_type + " neighborhood string.")
+        if not isinstance(new_state, int) or new_state < 0:
+            raise ValueError("Rule " + neighborhood + " must map to a non-negative integer state.")
+        digits = [int(ch) for ch in neighborhood]
+        largest = max(largest, new_state, max(digits))
+        parsed.append((digits, new_state))
+
+    if not isinstance(min_states, int) or min_states < 0:
+        raise ValueError("min_states must be a non-negative integer.")
+    num_states = max(min_states, largest + 1)
+    if default_state is not None:
+        if not isinstance(default_state, int) or default_state < 0:
+            raise ValueError("default_state must be a non-negative integer or None.")
+        num_states = max(num_states, default_state + 1)
+    if num_states ** n > MAX_TABLE_SIZE:
+        raise ValueError("Rule table would have " + str(num_states ** n) + " entries, which is too many.")
+
+    dtype = np.uint8 if num_states <= 256 else np.int64
+    if default_state is None:
+        # the center is the most significant digit of the index
+        table = (np.arange(num_states ** n) // num_states ** (n - 1)).astype(dtype)
+    else:
+        table = np.full(num_states ** n, default_state, dtype=dtype)
+
+    for digits, new_state in parsed:
+        index = 0
+        for d in digits:
+            index = index * num_states + d
+        table[index] = new_state
+
+    return table
+
+
+def encode_neighborhoods(cells: np.ndarray, neighborhood_type: str, num_states: int) -> np.ndarray:
+    """
+    Encode the neighborhood of every cell as its index into a compiled rule table.
+
+    Args:
+        cells (np.ndarray): 2D integer array of states in range(num_states).
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        num_states (int): Number of cell states k.
+
+    Returns:
+        np.ndarray: int64 array of the same shape as cells.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+        raise ValueError("cells must be a non-empty 2D NumPy array.")
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+    if cells.min() < 0 or cells.max() >= num_states:
+        raise ValueError("board contains states that the rule table does not cover.")
+
+    num_rows, num_cols = cells.shape
+
+    # off-board cells get the default 0 state
+    padded = np.zeros((num_rows + 2, num_cols + 2), dtype=np.int64)
+    padded[1:-1, 1:-1] = cells
+
+    # encode every cell's neighborhood as a base-k number, center first
+    index = padded[1:-1, 1:-1].copy()
+    for dr, dc in NEIGHBORHOOD_OFFSETS[neighborhood_type]:
+        index *= num_states
+        index += padded[1 + dr:1 + dr + num_rows, 1 + dc:1 + dc + num_cols]
+
+    return index
+
+
+def update_board_compiled(cells: np.ndarray, neighborhood_type: str, table: np.ndarray,
+                          num_states: int | None = None) -> np.ndarray:
+    """
+    Update a board array for one generation using a compiled rule table.
+
+    Args:
+        cells (np.ndarray): 2D integer array of cell states.
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        table (np.ndarray): Table from compile_rules() for the same neighborhood type.
+        num_states (int | None): Number of cell states k; worked out from the table's length if not given.
+
+    Returns:
+        np.ndarray: The board after one generation.
+    """
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+
+    n = len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1
+
+    # recover k from the table length k^n
+    if num_states is None:
+        num_states = int(round(len(table) ** (1.0 / n)))
+    if num_states ** n != len(table):
+        raise ValueError("table does not match the " + neighborhood_type + " neighborhood.")
+
+    return table[encode_neighborhoods(cells, neighborhood_type, num_states)]
+
+
+def undefined_neighborhoods(cells: np.ndarray, rule_table: RuleTable) -> list[str]:
+    """
+    Find the neighborhoods on a board that no rule covers, so that they fall back to the default.
+
+    Args:
+        cells (np.ndarray): 2D integer array of cell states.
+        rule_table (RuleTable): A compiled rule set.
+
+    Returns:
+        list[str]: The distinct uncovered neighborhoods, as rule strings.
+    """
+    index = encode_neighborhoods(cells, rule_table.neighborhood_type, rule_table.num_states)
+    missing = np.unique(index[~rule_table.defined[index]])
+
+    n = len(NEIGHBORHOOD_OFFSETS[rule_table.neighborhood_type]) + 1
+    neighborhoods = []
+    for code in missing.tolist():
+        digits = ""
+        for _ in range(n):
+            digits = str(code % rule_table.num_states) + digits
+            code //= rule_table.num_states
+        neighborhoods.append(digits)
+
+    return neighborhoods
+
+
+def play_automaton_arrays(initial_cells: np.ndarray, num_gens: int,
+                          neighborhood_type: str, table: np.ndarray) -> list[np.ndarray]:
+    """
+    Simulate an automaton on arrays with a compiled rule table.
+
+    Args:
+        initial_cells (np.ndarray): Starting board as a 2D integer array.
+        num_gens (int): Number of generations to simulate (>= 0).
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        table (np.ndarray): Table from compile_rules().
+
+    Returns:
+        list[np.ndarray]: Boards from the initial one through generation num_gens.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    boards = [np.asarray(initial_cells).astype(table.dtype)]
+
+    for i in range(num_gens):
+        boards.append(update_board_compiled(boards[i], neighborhood_type, table))
+
+    return boards
+
+
+def play_automaton_compiled(initial_board: GameBoard, num_gens: int,
+                            neighborhood_type: str,
+                            rules: dict[str, int] | RuleTable) -> list[GameBoard]:
+    """
+    Drop-in replacement for play_automaton() that compiles the rules once and updates whole boards at a time.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer, or an already
+            compiled RuleTable (e.g. from read_compiled_rules()).
+
+    Returns:
+        A list of GameBoards of length num_gens + 1.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    first_row_length = len(initial_board[0])
+    for row in initial_board:
+        if len(row) != first_row_length:
+            raise ValueError("Error: GameBoard is not rectangular.")
+
+    cells = np.array(initial_board, dtype=np.int64)
+    if cells.min() < 0:
+        raise ValueError("initial_board must only contain non-negative states.")
+
+    if isinstance(rules, RuleTable):
+        if rules.neighborhood_type != neighborhood_type:
+            raise ValueError("rules were compiled for a " + rules.neighborhood_type + " neighborhood.")
+        table = rules.table
+    else:
+        # make sure the table covers every state on the initial board as well as in the rules
+        table = compile_rules(rules, neighborhood_type, min_states=int(cells.max()) + 1)
+
+    boards = []
+    for board in play_automaton_arrays(cells, num_gens, neighborhood_type, table):
+        boards.append(board.tolist())
+
+    return boards
@@ -0,0 +1,286 @@
+"""
+Compact storage for the generations of a cellular automaton run.
+
+play_automaton() returns every generation as a full list of lists, which costs
+far more memory than the run contains information: in most automata only a
+small part of the board changes from one generation to the next. A
+BoardHistory stores generation i as the XOR of boards i - 1 and i, which is 0
+wherever nothing changed, and keeps only the runs of changed cells:
+
+    starts   flat index of the first cell of every run of changed cells
+    lengths  length of every run
+    values   the XOR values of the changed cells, run after run
+
+Every keyframe_interval-th generation is a keyframe, stored the same way but as
+its difference from an all-0 board, so reading any generation replays at most
+keyframe_interval - 1 deltas on top of a keyframe. The encoded generations are
+kept in memory or, when a path is given, appended to a file on disk.
+"""
+
+from collections.abc import Iterator
+import os
+import numpy as np
+from datatypes import GameBoard, RuleTable
+from fast_engine import NEIGHBORHOOD_OFFSETS, compile_rules, update_board_compiled
+
+
+def encode_delta(previous: np.ndarray, current: np.ndarray) -> bytes:
+    """
+    Encode the change from one board to the next as runs of XOR values.
+
+    Args:
+        previous (np.ndarray): The earlier board.
+        current (np.ndarray): The later board, with the same shape and dtype.
+
+    Returns:
+        bytes: The encoded delta, which is empty if the boards are equal.
+    """
+    xor = np.bitwise_xor(previous, current).ravel()
+    changed = np.flatnonzero(xor)
+    if len(changed) == 0:
+        return b""
+
+    # a new run starts wherever a changed cell doesn't directly follow the previous one
+    breaks = np.flatnonzero(np.diff(changed) != 1) + 1
+    run_starts = np.concatenate(([0], breaks))
+    starts = changed[run_starts]
+    lengths = np.diff(np.concatenate((run_starts, [len(changed)])))
+
+    header = np.array([len(starts), len(changed)], dtype=np.uint32)
+    return (header.tobytes() + starts.astype(np.uint32).tobytes()
+            + lengths.astype(np.uint32).tobytes() + xor[changed].tobytes())
+
+
+def apply_delta(board: np.ndarray, delta: bytes) -> None:
+    """
+    Apply a delta from encode_delta() to a board in place.
+
+    Args:
+        board (np.ndarray): The earlier board; it is turned into the later one.
+        delta (bytes): The encoded delta.
+    """
+    if len(delta) == 0:
+        return
+
+    num_runs, num_changed = np.frombuffer(delta, dtype=np.uint32, count=2).tolist()
+    starts = np.frombuffer(delta, dtype=np.uint32, count=num_runs, offset=8).astype(np.int64)
+    lengths = np.frombuffer(delta, dtype=np.uint32, count=num_runs, offset=8 + 4 * num_runs).astype(np.int64)
+    values = np.frombuffer(delta, dtype=board.dtype, count=num_changed, offset=8 + 8 * num_runs)
+
+    # expand the runs back into flat positions: each run's start plus 0, 1, ..., length - 1
+    run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.repeat(starts, lengths) + (np.arange(num_changed) - run_offsets)
+
+    flat = board.reshape(-1)
+    flat[positions] ^= values
+
+
+class BoardHistory:
+    """
+    The generations of a run, stored as keyframes plus deltas, with random access to any generation.
+    """
+
+    def __init__(self, shape: tuple[int, int], dtype: np.dtype = np.uint8,
+                 keyframe_interval: int = 64, path: str | None = None):
+        """
+        Args:
+            shape (tuple[int, int]): (num_rows, num_cols) of every board.
+            dtype (np.dtype): Integer dtype of the cells.
+            keyframe_interval (int): Store every keyframe_interval-th generation as a keyframe.
+            path (str | None): File to keep the encoded generations in; None keeps them in memory.
+        """
+        if len(shape) != 2 or shape[0] <= 0 or shape[1] <= 0:
+            raise ValueError("shape must be a pair of positive integers.")
+        if shape[0] * shape[1] >= 1 << 32:
+            raise ValueError("boards must have fewer than 2^32 cells.")
+        if not np.issubdtype(np.dtype(dtype), np.integer):
+            raise ValueError("dtype must be an integer type.")
+        if not isinstance(keyframe_interval, int) or keyframe_interval <= 0:
+            raise ValueError("keyframe_interval must be a positive integer.")
+
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.dtype = np.dtype(dtype)
+        self.keyframe_interval = keyframe_interval
+        self.path = path
+
+        # (offset, length) of every encoded generation in the file, or the encodings themselves
+        self._offsets: list[tuple[int, int]] = []
+        self._deltas: list[bytes] = []
+        self._file = open(path, "w+b") if path is not None else None
+        self._nbytes = 0
+
+        # the last board appended, and the last board decoded, to avoid replaying deltas
+        self._last: np.ndarray | None = None
+        self._cached_gen = -1
+        self._cached_board: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) if self._file is not None else len(self._deltas)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Number of bytes taken up by the encoded generations.
+        """
+        return self._nbytes
+
+    @property
+    def raw_nbytes(self) -> int:
+        """
+        Number of bytes the same generations would take up as full arrays.
+        """
+        return len(self) * self.shape[0] * self.shape[1] * self.dtype.itemsize
+
+    def append(self, cells: np.ndarray) -> None:
+        """
+        Add the next generation to the history.
+
+        Args:
+            cells (np.ndarray): The board, with the history's shape.
+        """
+        cells = np.asarray(cells)
+        if cells.shape != self.shape:
+            raise ValueError("board has shape " + str(cells.shape) + " but the history holds " + str(self.shape) + ".")
+        cells = cells.astype(self.dtype, copy=True)
+
+        if len(self) % self.keyframe_interval == 0:
+            delta = encode_delta(np.zeros(self.shape, dtype=self.dtype), cells)
+        else:
+            delta = encode_delta(self._last, cells)
+
+        if self._file is not None:
+            self._file.seek(0, os.SEEK_END)
+            self._offsets.append((self._file.tell(), len(delta)))
+            self._file.write(delta)
+        else:
+            self._deltas.append(delta)
+
+        self._nbytes += len(delta)
+        self._last = cells
+
+    def __getitem__(self, gen: int) -> np.ndarray:
+        """
+        Decode a generation (negative indices count from the end).
+
+        Returns:
+            np.ndarray: A fresh copy of the board.
+        """
+        if gen < 0:
+            gen += len(self)
+        if not 0 <= gen < len(self):
+            raise IndexError("generation " + str(gen) + " is not in the history.")
+
+        keyframe = gen - gen % self.keyframe_interval
+
+        # continue from the last decoded board if it lies between the keyframe and gen
+        if keyframe <= self._cached_gen <= gen:
+            board = self._cached_board.copy()
+            start = self._cached_gen + 1
+        else:
+            board = np.zeros(self.shape, dtype=self.dtype)
+            start = keyframe
+
+        for i in range(start, gen + 1):
+            apply_delta(board, self._read(i))
+
+        self._cached_gen = gen
+        self._cached_board = board.copy()
+
+        return board
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """
+        Decode the generations one after another, applying each delta once.
+        """
+        board = np.zeros(self.shape, dtype=self.dtype)
+        for i in range(len(self)):
+            if i % self.keyframe_interval == 0:
+                board[:] = 0
+            apply_delta(board, self._read(i))
+            yield board.copy()
+
+    def iter_game_boards(self) -> Iterator[GameBoard]:
+        """
+        Like iterating over the history, but yields GameBoards for the drawing code.
+        """
+        for board in self:
+            yield board.tolist()
+
+    def close(self) -> None:
+        """
+        Close the backing file, if any. The file itself is left on disk.
+        """
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "BoardHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read(self, gen: int) -> bytes:
+        """
+        Fetch the encoded generation gen.
+        """
+        if self._file is None:
+            return self._deltas[gen]
+
+        offset, length = self._offsets[gen]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+
+def record_automaton(initial_board: GameBoard, num_gens: int,
+                     neighborhood_type: str,
+                     rules: dict[str, int] | RuleTable,
+                     keyframe_interval: int = 64,
+                     path: str | None = None) -> BoardHistory:
+    """
+    Simulate an automaton like play_automaton(), but record the generations in a BoardHistory.
+
+    Only the current board is ever held in full, so memory follows the amount of change
+    rather than num_gens times the board size.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer, or a compiled RuleTable.
+        keyframe_interval: Store every keyframe_interval-th generation as a keyframe.
+        path: File to keep the history in; None keeps it in memory.
+
+    Returns:
+        A BoardHistory holding num_gens + 1 generations.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    first_row_length = len(initial_board[0])
+    for row in initial_board:
+        if len(row) != first_row_length:
+            raise ValueError("Error: GameBoard is not rectangular.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+
+    cells = np.array(initial_board, dtype=np.int64)
+    if cells.min() < 0:
+        raise ValueError("initial_board must only contain non-negative states.")
+
+    if isinstance(rules, RuleTable):
+        if rules.neighborhood_type != neighborhood_type:
+            raise ValueError("rules were compiled for a " + rules.neighborhood_type + " neighborhood.")
+        table = rules.table
+    else:
+        table = compile_rules(rules, neighborhood_type, min_states=int(cells.max()) + 1)
+
+    history = BoardHistory(cells.shape, table.dtype, keyframe_interval, path)
+
+    cells = cells.astype(table.dtype)
+    history.append(cells)
+    for _ in range(num_gens):
+        cells = update_board_compiled(cells, neighborhood_type, table)
+        history.append(cells)
+
+    return history
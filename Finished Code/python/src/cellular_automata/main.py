@@ -4,9 +4,10 @@ import numpy # for converting drawings to arrays that can be rendered as frames
 import imageio # for rendering videos
 
 # specific functions that we will need from elsewhere in the folder
-from custom_io import read_board_from_file, read_rules_from_file
-from functions import play_automaton 
-from drawing import draw_game_boards
+from custom_io import read_board_from_file, read_compiled_rules
+from fast_engine import undefined_neighborhoods
+from history import record_automaton
+from drawing import draw_game_board
 
 def main():
     print("Cellular automata!")
@@ -27,22 +28,26 @@ def main():
     # read in initial board and rule set
 
     initial_board = read_board_from_file(initial_board_file)
-    rules = read_rules_from_file(rule_file)
+    # the rules are parsed, checked and compiled into a lookup table once, and the table is
+    # cached next to the rule file so that the next run can load it directly
+    rules = read_compiled_rules(rule_file, neighborhood_type)
 
     print("Board and rules read from file.")
 
+    missing = undefined_neighborhoods(numpy.array(initial_board), rules)
+    if len(missing) > 0:
+        print("Warning:", len(missing), "neighborhoods on the initial board have no rule and will become state", rules.default_state)
+
     # then, we want to run the simulation
 
     print("Running simulation.")
-    boards = play_automaton(initial_board, num_gens, neighborhood_type, rules)
+    # same boards as play_automaton(), but every generation is computed with a single vectorized
+    # gather and stored only as the cells that changed since the previous one
+    history = record_automaton(initial_board, num_gens, neighborhood_type, rules)
 
     print("Simulation is complete!")
 
-    print("Drawing to canvases.")
-
-    surfaces = draw_game_boards(boards, cell_width)
-
-    print("Drawing done! Now, animating.")
+    print("Drawing to canvases and animating.")
 
     # we need a little bit more code to visualize the canvases that we have as an animation
 
@@ -51,8 +56,9 @@ def main():
     # create a writer object to write to file 
     writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality = 8)
 
-    # range over surface objects and draw each one 
-    for surface in surfaces:
+    # decode one board at a time and draw it, so that we never hold all boards or surfaces at once
+    for board in history.iter_game_boards():
+        surface = draw_game_board(board, cell_width)
         # writer needs to convert the surface to a numpy array
         frame = pygame_surface_to_numpy(surface)
         writer.append_data(frame)
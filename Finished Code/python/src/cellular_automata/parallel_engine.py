@@ -0,0 +1,313 @@
+"""
+Update large cellular automaton boards in parallel, one band of rows per process.
+
+A cell's next state depends only on the row above it, its own row and the row
+below it. So we split the board into contiguous bands of rows, one per process,
+and a process can update its band as long as it can see one extra "halo" row
+on either side, which belongs to the neighboring bands.
+
+Rather than sending boards through a Queue every generation, the board lives
+in a block of shared memory that holds two copies of it (the current and the
+next generation), each with an extra row of 0s above and below. Every worker
+attaches to that block once and then, for each generation,
+
+    1. reads its band plus the halo rows from the current copy,
+    2. writes the updated band into the next copy,
+    3. reports the finished generation to the main process through its Pipe, and
+    4. waits for the main process to send the signal to go on,
+
+after which the two copies trade roles. The halo exchange is therefore just
+reading the neighboring bands' edge rows straight out of shared memory once
+every band has reported. The main process sends the signal only after reading
+off the finished generation, so no worker can overwrite it too early.
+
+We don't use a Barrier for this: a worker killed from outside (e.g. by the
+out-of-memory killer) while holding the Barrier's internal lock would leave
+every other process stuck in it for good. The main process instead waits on
+the workers' pipes together with their process sentinels, so it notices at
+once when a worker dies without reporting, stops the others and raises.
+"""
+
+from collections.abc import Iterator
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+import numpy as np
+from datatypes import GameBoard, RuleTable
+from fast_engine import NEIGHBORHOOD_OFFSETS, compile_rules, encode_neighborhoods
+
+
+def make_row_bands(total_rows: int, num_procs: int) -> list[tuple[int, int]]:
+    """
+    Split the rows of a board into contiguous bands of nearly equal size.
+
+    Args:
+        total_rows (int): Number of rows of the board.
+        num_procs (int): Number of bands wanted.
+
+    Returns:
+        list[tuple[int, int]]: (row_start, row_end) pairs, with row_end exclusive.
+    """
+    if not isinstance(total_rows, int) or total_rows <= 0:
+        raise ValueError("total_rows must be a positive integer.")
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer.")
+
+    num_procs = min(num_procs, total_rows)
+    bands = []
+    for p in range(num_procs):
+        bands.append((p * total_rows // num_procs, (p + 1) * total_rows // num_procs))
+
+    return bands
+
+
+def update_band(current: np.ndarray, following: np.ndarray, row_start: int, row_end: int,
+                neighborhood_type: str, table: np.ndarray, num_states: int) -> None:
+    """
+    Update the rows row_start to row_end (exclusive) of a board for one generation.
+
+    current and following hold the board with an extra row of 0s above and below, so
+    board row r is stored at index r + 1.
+
+    Args:
+        current (np.ndarray): The current generation, padded as above.
+        following (np.ndarray): Array receiving the next generation, padded the same way.
+        row_start (int): First board row of the band.
+        row_end (int): One past the last board row of the band.
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        table (np.ndarray): Table from compile_rules().
+        num_states (int): Number of cell states k.
+    """
+    # the band together with its halo rows
+    band = current[row_start:row_end + 2]
+
+    # encode_neighborhoods() treats the halo rows as cells too; we just drop their results
+    index = encode_neighborhoods(band, neighborhood_type, num_states)[1:-1]
+    following[row_start + 1:row_end + 1] = table[index]
+
+
+def update_band_worker(shm_name: str, shape: tuple[int, int, int], dtype: str,
+                       row_start: int, row_end: int, num_gens: int,
+                       neighborhood_type: str, table: np.ndarray, num_states: int,
+                       conn: Connection) -> None:
+    """
+    Body of a worker process: update one band for num_gens generations.
+
+    Args:
+        shm_name (str): Name of the shared memory block holding both copies of the board.
+        shape (tuple[int, int, int]): (2, num_rows + 2, num_cols), the shape of that block.
+        dtype (str): NumPy dtype of the cells.
+        row_start (int): First board row of the band.
+        row_end (int): One past the last board row of the band.
+        num_gens (int): Number of generations to simulate.
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        table (np.ndarray): Table from compile_rules().
+        num_states (int): Number of cell states k.
+        conn (Connection): This worker's end of its Pipe to the main process.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    boards = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        for gen in range(num_gens):
+            update_band(boards[gen % 2], boards[(gen + 1) % 2], row_start, row_end,
+                        neighborhood_type, table, num_states)
+            conn.send(gen)
+            if gen + 1 < num_gens and not conn.recv():
+                break
+    except (EOFError, OSError):
+        # the main process is gone
+        pass
+    finally:
+        del boards
+        shm.close()
+        conn.close()
+
+
+def wait_for_bands(conns: list[Connection], procs: list[multiprocessing.Process], gen: int) -> None:
+    """
+    Wait until every worker has reported that its band of generation gen is done.
+
+    Args:
+        conns (list[Connection]): The main process's ends of the workers' pipes.
+        procs (list[multiprocessing.Process]): The workers, in the same order.
+        gen (int): The generation being waited for, for error messages.
+    """
+    pending = {conn: p for conn, p in zip(conns, procs)}
+    while len(pending) > 0:
+        sentinels = {p.sentinel: conn for conn, p in pending.items()}
+        for ready in wait(list(pending) + list(sentinels)):
+            conn = sentinels.get(ready, ready)
+            if conn not in pending:
+                continue
+            # a worker that exits right after reporting its last generation still has its report waiting
+            try:
+                if conn.poll():
+                    conn.recv()
+                    del pending[conn]
+                    continue
+            except (EOFError, OSError):
+                pass
+
+            p = pending[conn]
+            p.join()
+            raise RuntimeError("a worker process exited with code " + str(p.exitcode)
+                               + " before finishing generation " + str(gen) + ".")
+
+
+def stop_workers(procs: list[multiprocessing.Process], timeout: float = 5.0) -> None:
+    """
+    Wait for worker processes to exit, terminating any that don't within the timeout.
+    """
+    for p in procs:
+        p.join(timeout)
+        if p.is_alive():
+            p.terminate()
+            p.join()
+
+
+def stream_automaton_parallel(initial_cells: np.ndarray, num_gens: int,
+                              neighborhood_type: str, table: np.ndarray,
+                              num_procs: int | None = None,
+                              frequency: int = 1) -> Iterator[np.ndarray]:
+    """
+    Simulate an automaton with one process per band of rows, yielding generations as they finish.
+
+    Args:
+        initial_cells (np.ndarray): Starting board as a 2D integer array.
+        num_gens (int): Number of generations to simulate (>= 0).
+        neighborhood_type (str): Either "Moore" or "vonNeumann".
+        table (np.ndarray): Table from compile_rules().
+        num_procs (int | None): Number of worker processes; defaults to the number of cores.
+        frequency (int): Yield every frequency-th generation (the initial board is always yielded).
+
+    Returns:
+        Iterator[np.ndarray]: Copies of the board at generations 0, frequency, 2 * frequency, ...
+            Bad arguments raise ValueError right away rather than on the first next().
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not isinstance(frequency, int) or frequency <= 0:
+        raise ValueError("frequency must be a positive integer.")
+    if neighborhood_type not in NEIGHBORHOOD_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+
+    cells = np.asarray(initial_cells)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("initial_cells must be a non-empty 2D array.")
+
+    n = len(NEIGHBORHOOD_OFFSETS[neighborhood_type]) + 1
+    num_states = int(round(len(table) ** (1.0 / n)))
+    if num_states ** n != len(table):
+        raise ValueError("table does not match the " + neighborhood_type + " neighborhood.")
+    if cells.min() < 0 or cells.max() >= num_states:
+        raise ValueError("board contains states that the rule table does not cover.")
+
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    bands = make_row_bands(cells.shape[0], num_procs)
+
+    # the checks above run as soon as we are called; the generator only starts workers once iterated
+    return _stream_automaton_parallel(cells, num_gens, neighborhood_type, table, num_states, bands, frequency)
+
+
+def _stream_automaton_parallel(cells: np.ndarray, num_gens: int, neighborhood_type: str,
+                               table: np.ndarray, num_states: int, bands: list[tuple[int, int]],
+                               frequency: int) -> Iterator[np.ndarray]:
+    """
+    Generator behind stream_automaton_parallel(), which validates its arguments first.
+    """
+    num_rows, num_cols = cells.shape
+    shape = (2, num_rows + 2, num_cols)
+    dtype = table.dtype
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * dtype.itemsize)
+    boards = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    # both copies start out with their padding rows at 0
+    boards[:] = 0
+    boards[0, 1:-1] = cells
+
+    procs = []
+    conns = []
+    try:
+        for row_start, row_end in bands:
+            conn, worker_conn = multiprocessing.Pipe()
+            conns.append(conn)
+            p = multiprocessing.Process(target=update_band_worker,
+                                        args=(shm.name, shape, dtype.str, row_start, row_end, num_gens,
+                                              neighborhood_type, table, num_states, worker_conn))
+            p.start()
+            procs.append(p)
+            worker_conn.close()
+
+        yield boards[0, 1:-1].copy()
+
+        for gen in range(1, num_gens + 1):
+            wait_for_bands(conns, procs, gen)
+
+            # the workers can't overwrite this copy until we tell them to go on
+            if gen % frequency == 0:
+                yield boards[gen % 2, 1:-1].copy()
+
+            if gen < num_gens:
+                for conn, p in zip(conns, procs):
+                    try:
+                        conn.send(True)
+                    except OSError:
+                        p.join()
+                        raise RuntimeError("a worker process exited with code " + str(p.exitcode)
+                                           + " after generation " + str(gen) + ".")
+    finally:
+        # tell any worker still running to stop; closing our ends alone isn't enough,
+        # since the workers started after a pipe was made hold copies of our end too
+        for conn in conns:
+            try:
+                conn.send(False)
+            except OSError:
+                pass
+            conn.close()
+        stop_workers(procs)
+        del boards
+        shm.close()
+        shm.unlink()
+
+
+def play_automaton_parallel(initial_board: GameBoard, num_gens: int,
+                            neighborhood_type: str,
+                            rules: dict[str, int] | RuleTable,
+                            num_procs: int | None = None) -> list[GameBoard]:
+    """
+    Drop-in replacement for play_automaton() that updates bands of rows in parallel.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer, or a compiled RuleTable.
+        num_procs: Number of worker processes; defaults to the number of cores.
+
+    Returns:
+        A list of GameBoards of length num_gens + 1.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    first_row_length = len(initial_board[0])
+    for row in initial_board:
+        if len(row) != first_row_length:
+            raise ValueError("Error: GameBoard is not rectangular.")
+
+    cells = np.array(initial_board, dtype=np.int64)
+    if cells.min() < 0:
+        raise ValueError("initial_board must only contain non-negative states.")
+
+    if isinstance(rules, RuleTable):
+        if rules.neighborhood_type != neighborhood_type:
+            raise ValueError("rules were compiled for a " + rules.neighborhood_type + " neighborhood.")
+        table = rules.table
+    else:
+        table = compile_rules(rules, neighborhood_type, min_states=int(cells.max()) + 1)
+
+    boards = []
+    for board in stream_automaton_parallel(cells, num_gens, neighborhood_type, table, num_procs):
+        boards.append(board.tolist())
+
+    return boards
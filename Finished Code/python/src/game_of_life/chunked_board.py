@@ -0,0 +1,323 @@
+"""
+A sparse Game of Life board stored as fixed-size tiles.
+
+initialize_board() fixes a finite grid and in_field() treats everything outside
+of it as dead, so gliders die at the edge, and making the grid bigger to avoid
+this costs memory in proportion to its area. A ChunkedBoard instead keeps a
+dictionary mapping tile coordinates (tile_row, tile_col) to tile_size x tile_size
+NumPy uint8 tiles. Tiles are created when a live cell first appears in them and
+dropped as soon as they are empty, so memory follows the live pattern rather
+than the area it has visited.
+
+Two boundary modes are supported:
+    "infinite": the board is the whole plane, so patterns can travel forever.
+    "toroidal": the board is num_rows x num_cols and wraps around at the edges.
+"""
+
+import math
+import numpy as np
+from datatypes import GameBoard
+from fast_engine import board_to_array, count_live_neighbors_padded, apply_life_rules
+
+# smallest tile width from_board() will pick by itself for a toroidal board
+MIN_DEFAULT_TILE_SIZE = 8
+
+# the eight neighboring tiles, as (tile row offset, tile col offset)
+TILE_NEIGHBORS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+class ChunkedBoard:
+    """
+    A Game of Life board made of tiles that are created on demand.
+
+    Cells are addressed by (row, col) coordinates; in "infinite" mode these may be
+    any integers, and in "toroidal" mode they are taken modulo the board size.
+    """
+
+    def __init__(self, mode: str = "infinite", tile_size: int = 64,
+                 num_rows: int | None = None, num_cols: int | None = None):
+        """
+        Args:
+            mode (str): "infinite" or "toroidal".
+            tile_size (int): Width and height of every tile, in cells.
+            num_rows (int | None): Number of rows of the torus (toroidal mode only).
+            num_cols (int | None): Number of columns of the torus (toroidal mode only).
+        """
+        if mode not in ("infinite", "toroidal"):
+            raise ValueError('mode must be "infinite" or "toroidal".')
+        if not isinstance(tile_size, int) or tile_size <= 0:
+            raise ValueError("tile_size must be a positive integer.")
+
+        if mode == "toroidal":
+            if not isinstance(num_rows, int) or num_rows <= 0 or not isinstance(num_cols, int) or num_cols <= 0:
+                raise ValueError("num_rows and num_cols must be positive integers in toroidal mode.")
+            if num_rows % tile_size != 0 or num_cols % tile_size != 0:
+                raise ValueError("num_rows and num_cols must be multiples of tile_size in toroidal mode.")
+
+        self.mode = mode
+        self.tile_size = tile_size
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.generation = 0
+        self.tiles: dict[tuple[int, int], np.ndarray] = {}
+
+    @classmethod
+    def from_board(cls, board: GameBoard, mode: str = "infinite",
+                   tile_size: int | None = None) -> "ChunkedBoard":
+        """
+        Create a ChunkedBoard holding a GameBoard with its top-left cell at (0, 0).
+        Args:
+            board (GameBoard): The starting game board.
+            mode (str): "infinite", or "toroidal" to wrap around at the board's edges.
+            tile_size (int | None): Tile width; defaults to 64 in infinite mode and to the
+                largest divisor of both board dimensions that is at most 64 in toroidal mode.
+                In toroidal mode, a ValueError is raised if that divisor is smaller than
+                MIN_DEFAULT_TILE_SIZE (and than the board), rather than falling back to tiny tiles.
+        Returns:
+            ChunkedBoard: The new board.
+        """
+        cells = board_to_array(board)
+        num_rows, num_cols = cells.shape
+
+        if tile_size is None:
+            tile_size = 64
+            if mode == "toroidal":
+                common = math.gcd(num_rows, num_cols)
+                while common % tile_size != 0:
+                    tile_size -= 1
+                # e.g. a 101 x 100 torus only shares the divisor 1, and 1 x 1 tiles would be far slower than a flat array
+                if tile_size < min(MIN_DEFAULT_TILE_SIZE, num_rows, num_cols):
+                    raise ValueError("the largest tile size dividing both " + str(num_rows) + " and " + str(num_cols)
+                                     + " is " + str(tile_size) + "; pass a tile_size that divides both dimensions,"
+                                     + " or resize the board so they share a larger divisor.")
+
+        if mode == "toroidal":
+            chunked = cls(mode, tile_size, num_rows, num_cols)
+        else:
+            chunked = cls(mode, tile_size)
+
+        rows, cols = np.nonzero(cells)
+        chunked.set_cells(rows, cols)
+
+        return chunked
+
+    # ------------------------- Cell access -------------------------
+
+    @property
+    def population(self) -> int:
+        """
+        Number of live cells on the board.
+        """
+        total = 0
+        for tile in self.tiles.values():
+            total += int(tile.sum())
+        return total
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, alive: bool = True) -> None:
+        """
+        Set the given cells alive (or dead), creating or dropping tiles as needed.
+        Args:
+            rows (np.ndarray): Row coordinates of the cells.
+            cols (np.ndarray): Column coordinates of the cells, matching rows.
+            alive (bool): State to give the cells.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        if rows.shape != cols.shape:
+            raise ValueError("rows and cols must have the same shape.")
+
+        if self.mode == "toroidal":
+            rows = rows % self.num_rows
+            cols = cols % self.num_cols
+
+        t = self.tile_size
+        tile_rows = rows // t
+        tile_cols = cols // t
+
+        for key in set(zip(tile_rows.tolist(), tile_cols.tolist())):
+            in_tile = (tile_rows == key[0]) & (tile_cols == key[1])
+            tile = self.tiles.get(key)
+            if tile is None:
+                if not alive:
+                    continue
+                tile = np.zeros((t, t), dtype=np.uint8)
+                self.tiles[key] = tile
+            tile[rows[in_tile] - key[0] * t, cols[in_tile] - key[1] * t] = 1 if alive else 0
+            if not tile.any():
+                del self.tiles[key]
+
+    def bounding_box(self) -> tuple[int, int, int, int] | None:
+        """
+        Find the smallest rectangle containing every live cell.
+        Returns:
+            tuple[int, int, int, int] | None: (top, left, num_rows, num_cols), or None if the board is empty.
+        """
+        if len(self.tiles) == 0:
+            return None
+
+        t = self.tile_size
+        top, left = None, None
+        bottom, right = None, None
+        for (tr, tc), tile in self.tiles.items():
+            rows, cols = np.nonzero(tile)
+            r0, r1 = tr * t + int(rows.min()), tr * t + int(rows.max())
+            c0, c1 = tc * t + int(cols.min()), tc * t + int(cols.max())
+            top = r0 if top is None else min(top, r0)
+            bottom = r1 if bottom is None else max(bottom, r1)
+            left = c0 if left is None else min(left, c0)
+            right = c1 if right is None else max(right, c1)
+
+        return top, left, bottom - top + 1, right - left + 1
+
+    def to_board(self, top: int = 0, left: int = 0,
+                 num_rows: int | None = None, num_cols: int | None = None) -> GameBoard:
+        """
+        Export a rectangular window of the board as a GameBoard.
+        Args:
+            top (int): Row coordinate of the window's top-left cell.
+            left (int): Column coordinate of the window's top-left cell.
+            num_rows (int | None): Window height; defaults to the torus height in toroidal mode.
+            num_cols (int | None): Window width; defaults to the torus width in toroidal mode.
+        Returns:
+            GameBoard: The cells inside the window.
+        """
+        return self.to_array(top, left, num_rows, num_cols).astype(bool).tolist()
+
+    def to_array(self, top: int = 0, left: int = 0,
+                 num_rows: int | None = None, num_cols: int | None = None) -> np.ndarray:
+        """
+        Like to_board(), but returns the window as a uint8 array.
+        """
+        if num_rows is None:
+            num_rows = self.num_rows
+        if num_cols is None:
+            num_cols = self.num_cols
+        if not isinstance(num_rows, int) or num_rows <= 0 or not isinstance(num_cols, int) or num_cols <= 0:
+            raise ValueError("num_rows and num_cols must be positive integers.")
+
+        t = self.tile_size
+        window = np.zeros((num_rows, num_cols), dtype=np.uint8)
+
+        # range over the tiles overlapping the window and copy in the overlapping part
+        for tr in range(top // t, (top + num_rows - 1) // t + 1):
+            for tc in range(left // t, (left + num_cols - 1) // t + 1):
+                tile = self.tiles.get(self._wrap(tr, tc))
+                if tile is None:
+                    continue
+                r0, r1 = max(top, tr * t), min(top + num_rows, (tr + 1) * t)
+                c0, c1 = max(left, tc * t), min(left + num_cols, (tc + 1) * t)
+                window[r0 - top:r1 - top, c0 - left:c1 - left] = tile[r0 - tr * t:r1 - tr * t, c0 - tc * t:c1 - tc * t]
+
+        return window
+
+    # ------------------------- Evolution -------------------------
+
+    def step(self) -> None:
+        """
+        Advance the board by one generation.
+        """
+        # existing tiles, plus any neighboring tile that live cells on an edge could spill into
+        candidates = set(self.tiles.keys())
+        for key, tile in self.tiles.items():
+            for dr, dc in TILE_NEIGHBORS:
+                if self._touches_edge(tile, dr, dc):
+                    candidates.add(self._wrap(key[0] + dr, key[1] + dc))
+
+        new_tiles: dict[tuple[int, int], np.ndarray] = {}
+        for key in candidates:
+            counts = count_live_neighbors_padded(self._padded_tile(key))
+            tile = self.tiles.get(key)
+            if tile is None:
+                # an empty tile can only gain births
+                tile = np.zeros_like(counts)
+            next_tile = apply_life_rules(tile, counts)
+
+            # empty tiles are dropped rather than stored
+            if next_tile.any():
+                new_tiles[key] = next_tile
+
+        self.tiles = new_tiles
+        self.generation += 1
+
+    def advance(self, num_gens: int) -> None:
+        """
+        Advance the board by num_gens generations.
+        """
+        if not isinstance(num_gens, int) or num_gens < 0:
+            raise ValueError("num_gens must be a non-negative integer.")
+
+        for _ in range(num_gens):
+            self.step()
+
+    def _wrap(self, tile_row: int, tile_col: int) -> tuple[int, int]:
+        """
+        Map tile coordinates onto the torus in toroidal mode (no-op in infinite mode).
+        """
+        if self.mode == "toroidal":
+            return tile_row % (self.num_rows // self.tile_size), tile_col % (self.num_cols // self.tile_size)
+        return tile_row, tile_col
+
+    def _touches_edge(self, tile: np.ndarray, dr: int, dc: int) -> bool:
+        """
+        Check whether a tile has live cells on the edge (or corner) facing direction (dr, dc).
+        """
+        rows = slice(None) if dr == 0 else (0 if dr == -1 else -1)
+        cols = slice(None) if dc == 0 else (0 if dc == -1 else -1)
+        return bool(np.any(tile[rows, cols]))
+
+    def _padded_tile(self, key: tuple[int, int]) -> np.ndarray:
+        """
+        Return a tile surrounded by the one-cell border it sees from its eight neighboring tiles.
+        """
+        t = self.tile_size
+        padded = np.zeros((t + 2, t + 2), dtype=np.uint8)
+
+        tile = self.tiles.get(key)
+        if tile is not None:
+            padded[1:-1, 1:-1] = tile
+
+        # for each direction: which part of the neighbor to copy, and where it goes in padded
+        borders = {
+            (-1, -1): ((-1, -1), (0, 0)),
+            (-1, 0): ((-1, slice(None)), (0, slice(1, -1))),
+            (-1, 1): ((-1, 0), (0, -1)),
+            (0, -1): ((slice(None), -1), (slice(1, -1), 0)),
+            (0, 1): ((slice(None), 0), (slice(1, -1), -1)),
+            (1, -1): ((0, -1), (-1, 0)),
+            (1, 0): ((0, slice(None)), (-1, slice(1, -1))),
+            (1, 1): ((0, 0), (-1, -1)),
+        }
+        for (dr, dc), (source, target) in borders.items():
+            neighbor = self.tiles.get(self._wrap(key[0] + dr, key[1] + dc))
+            if neighbor is not None:
+                padded[target] = neighbor[source]
+
+        return padded
+
+
+def play_game_of_life_chunked(initial_board: GameBoard, num_gens: int,
+                              mode: str = "infinite",
+                              tile_size: int | None = None) -> list[GameBoard]:
+    """
+    Simulate Game of Life on a ChunkedBoard, viewing the same window as the initial board.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The number of generations to simulate.
+        mode (str): "infinite" or "toroidal".
+        tile_size (int | None): See ChunkedBoard.from_board().
+    Returns:
+        list[GameBoard]: Boards from initial through num_gens generations.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    chunked = ChunkedBoard.from_board(initial_board, mode, tile_size)
+    num_rows = len(initial_board)
+    num_cols = len(initial_board[0])
+
+    boards = [chunked.to_board(0, 0, num_rows, num_cols)]
+    for _ in range(num_gens):
+        chunked.step()
+        boards.append(chunked.to_board(0, 0, num_rows, num_cols))
+
+    return boards
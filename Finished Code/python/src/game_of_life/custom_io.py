@@ -1,3 +1,5 @@
+import re
+import numpy as np
 from datatypes import GameBoard
 
 from functions import assert_rectangular
@@ -81,3 +83,293 @@ def set_row_values(line_elements: list[str]) -> list[bool]:
             raise ValueError("Error: invalid entry in board file.")
 
     return current_row
+
+
+# ------------------------- Array-based board formats -------------------------
+
+# read_board_from_file() builds a GameBoard one string at a time, which is fine for
+# our small CSV boards but far too slow for big ones, and can't read the RLE files
+# that pattern collections are distributed in. The functions below read and write
+# boards directly as NumPy uint8 arrays (1 = alive, 0 = dead) in three formats:
+#     .csv  our comma-separated 0/1 format
+#     .rle  the standard run-length encoded pattern format
+#     .golb a packed binary format: the magic bytes GOLB, the number of rows and
+#           columns as little-endian uint32s, then the cells row by row, 8 per byte
+
+PACKED_MAGIC = b"GOLB"
+
+
+def read_board_array(filename: str) -> np.ndarray:
+    """
+    Read a board into a NumPy array, choosing the format from the file extension.
+    Args:
+        filename (str): Path to a .csv, .rle, or .golb file.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s.
+    """
+    if (not isinstance(filename, str)) or len(filename) == 0:
+        raise ValueError("filename must be a non-empty string.")
+
+    lower = filename.lower()
+    if lower.endswith(".rle"):
+        return read_rle_file(filename)
+    if lower.endswith(".golb"):
+        return read_packed_board(filename)
+    if lower.endswith(".csv"):
+        return read_csv_board_array(filename)
+
+    raise ValueError("Error: unknown board file extension (expected .csv, .rle, or .golb).")
+
+
+def write_board_array(cells: np.ndarray, filename: str) -> None:
+    """
+    Write a board array, choosing the format from the file extension.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+        filename (str): Path to a .csv, .rle, or .golb file.
+    """
+    if (not isinstance(filename, str)) or len(filename) == 0:
+        raise ValueError("filename must be a non-empty string.")
+
+    lower = filename.lower()
+    if lower.endswith(".rle"):
+        write_rle_file(cells, filename)
+    elif lower.endswith(".golb"):
+        write_packed_board(cells, filename)
+    elif lower.endswith(".csv"):
+        _check_cells(cells)
+        np.savetxt(filename, cells != 0, fmt="%d", delimiter=",")
+    else:
+        raise ValueError("Error: unknown board file extension (expected .csv, .rle, or .golb).")
+
+
+def read_csv_board_array(filename: str) -> np.ndarray:
+    """
+    Read one of our comma-separated 0/1 board files straight into an array.
+    Args:
+        filename (str): The name of the CSV file.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s.
+    """
+    cells = np.loadtxt(filename, delimiter=",", dtype=np.uint8, ndmin=2)
+
+    if cells.size == 0 or np.any(cells > 1):
+        raise ValueError("Error: invalid entry in board file.")
+
+    return cells
+
+
+def read_packed_board(filename: str) -> np.ndarray:
+    """
+    Read a board stored in the packed binary .golb format.
+    Args:
+        filename (str): The name of the file.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    if len(data) < 12 or data[:4] != PACKED_MAGIC:
+        raise ValueError("Error: not a packed board file.")
+
+    num_rows, num_cols = np.frombuffer(data, dtype="<u4", count=2, offset=4)
+    num_cells = int(num_rows) * int(num_cols)
+
+    packed = np.frombuffer(data, dtype=np.uint8, offset=12)
+    if len(packed) * 8 < num_cells:
+        raise ValueError("Error: packed board file is truncated.")
+
+    cells = np.unpackbits(packed, count=num_cells)
+    return cells.reshape(int(num_rows), int(num_cols))
+
+
+def write_packed_board(cells: np.ndarray, filename: str) -> None:
+    """
+    Write a board in the packed binary .golb format.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+        filename (str): The name of the file.
+    """
+    _check_cells(cells)
+
+    header = np.array(cells.shape, dtype="<u4").tobytes()
+    with open(filename, "wb") as f:
+        f.write(PACKED_MAGIC)
+        f.write(header)
+        f.write(np.packbits(cells != 0).tobytes())
+
+
+def read_rle_file(filename: str) -> np.ndarray:
+    """
+    Read a pattern in run-length encoded (RLE) format.
+    Args:
+        filename (str): The name of the .rle file.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s, sized by the file's "x = ..., y = ..." header.
+    """
+    with open(filename, "r") as f:
+        text = f.read()
+
+    return parse_rle(text)
+
+
+def parse_rle(text: str) -> np.ndarray:
+    """
+    Decode the contents of an RLE file into a board array.
+
+    In the body, "b" is a dead cell, any other letter a live cell, "$" ends a row,
+    "!" ends the pattern, and a number in front of any of these repeats it.
+    Args:
+        text (str): Contents of an RLE file.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s.
+    """
+    lines = text.strip().splitlines()
+
+    # skip comment lines, then read the header line "x = <cols>, y = <rows>, rule = ..."
+    index = 0
+    while index < len(lines) and lines[index].startswith("#"):
+        index += 1
+    if index == len(lines):
+        raise ValueError("Error: RLE file has no header line.")
+
+    header = re.match(r"\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)", lines[index])
+    if header is None:
+        raise ValueError("Error: invalid RLE header line.")
+    num_cols = int(header.group(1))
+    num_rows = int(header.group(2))
+    if num_rows == 0 or num_cols == 0:
+        raise ValueError("Error: RLE board must have at least one row and one column.")
+
+    body = re.sub(r"\s", "", "".join(lines[index + 1:]).split("!")[0])
+
+    cells = np.zeros((num_rows, num_cols), dtype=np.uint8)
+    if len(body) == 0:
+        return cells
+
+    # tokenize the body as bytes: every non-digit is a tag, preceded by its (optional) count
+    chars = np.frombuffer(body.encode("ascii", errors="replace"), dtype=np.uint8)
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_letter = ((chars | 0x20) >= ord("a")) & ((chars | 0x20) <= ord("z"))
+    if not np.all(is_digit | is_letter | (chars == ord("$"))) or is_digit[-1]:
+        raise ValueError("Error: invalid RLE pattern body.")
+
+    tag_positions = np.nonzero(~is_digit)[0]
+    previous_tag = np.concatenate(([-1], tag_positions[:-1]))
+    num_digits = tag_positions - previous_tag - 1
+
+    # read each count one digit at a time, most significant digit first
+    counts = np.zeros(len(tag_positions), dtype=np.int64)
+    for k in range(int(num_digits.max())):
+        has_digit = num_digits > k
+        digit_position = np.where(has_digit, previous_tag + 1 + k, 0)
+        next_digit = chars[digit_position].astype(np.int64) - ord("0")
+        counts = np.where(has_digit, counts * 10 + next_digit, counts)
+    counts[num_digits == 0] = 1
+
+    tags = chars[tag_positions]
+    is_newline = tags == ord("$")
+    is_alive = ~is_newline & (tags != ord("b"))
+
+    # row of every token: how many rows the "$" tokens before it have ended
+    rows = np.cumsum(np.where(is_newline, counts, 0)) - np.where(is_newline, counts, 0)
+
+    # column where every run starts: cells emitted so far, minus those emitted before the current row began
+    lengths = np.where(is_newline, 0, counts)
+    emitted_before = np.cumsum(lengths) - lengths
+    row_start = np.maximum.accumulate(np.where(is_newline, emitted_before, 0))
+    cols = emitted_before - row_start
+
+    rows, cols, counts = rows[is_alive], cols[is_alive], counts[is_alive]
+    if np.any(rows >= num_rows) or np.any(cols + counts > num_cols):
+        raise ValueError("Error: RLE pattern does not fit in the size given by its header.")
+
+    # expand every live run into the flat indices of its cells
+    total = int(counts.sum())
+    run_starts = np.cumsum(counts) - counts
+    within_run = np.arange(total) - np.repeat(run_starts, counts)
+    flat_index = np.repeat(rows * num_cols + cols, counts) + within_run
+
+    cells.ravel()[flat_index] = 1
+    return cells
+
+
+def write_rle_file(cells: np.ndarray, filename: str, rule: str = "B3/S23") -> None:
+    """
+    Write a board in run-length encoded (RLE) format.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+        filename (str): The name of the .rle file.
+        rule (str): Rule string written in the header.
+    """
+    with open(filename, "w") as f:
+        f.write(format_rle(cells, rule))
+
+
+def format_rle(cells: np.ndarray, rule: str = "B3/S23") -> str:
+    """
+    Encode a board array as the text of an RLE file.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+        rule (str): Rule string written in the header.
+    Returns:
+        str: The RLE text, with body lines at most 70 characters long.
+    """
+    _check_cells(cells)
+    num_rows, num_cols = cells.shape
+    alive = (cells != 0).ravel()
+
+    # a run starts at the beginning of every row and wherever a cell differs from the one to its left
+    run_starts = np.ones((num_rows, num_cols), dtype=bool)
+    run_starts[:, 1:] = (cells[:, 1:] != 0) != (cells[:, :-1] != 0)
+    starts = np.nonzero(run_starts.ravel())[0]
+    lengths = np.diff(np.append(starts, num_rows * num_cols))
+    rows = starts // num_cols
+    values = alive[starts]
+
+    # a dead run that ends its row is left out (this also drops rows that are entirely dead)
+    ends_row = np.append(rows[1:] != rows[:-1], True)
+    keep = values | ~ends_row
+    lengths, rows, values = lengths[keep], rows[keep], values[keep]
+
+    # before the first run of each row, "$" tokens end the previous row and skip empty rows
+    previous_row = np.concatenate(([0], rows[:-1]))
+    row_gaps = rows - previous_row
+
+    # interleave the row gaps and runs as (count, symbol) tokens, skipping zero-length gaps
+    counts = np.empty(2 * len(lengths), dtype=np.int64)
+    counts[0::2] = row_gaps
+    counts[1::2] = lengths
+    symbols = np.empty(2 * len(lengths), dtype=np.int8)
+    symbols[0::2] = 0
+    symbols[1::2] = np.where(values, 2, 1)
+    present = counts > 0
+    counts, symbols = counts[present], symbols[present]
+
+    # a count of 1 is left out of its token
+    symbol_strings = ["$", "b", "o"]
+    tokens = [(str(n) if n > 1 else "") + symbol_strings[k]
+              for n, k in zip(counts.tolist(), symbols.tolist())]
+    tokens.append("!")
+
+    # wrap body lines at 70 characters without splitting a token
+    num_digits = np.where(counts > 1, np.floor(np.log10(np.maximum(counts, 1))).astype(np.int64) + 1, 0)
+    token_ends = np.cumsum(np.append(num_digits + 1, 1))
+    lines = [f"x = {num_cols}, y = {num_rows}, rule = {rule}"]
+    first = 0
+    while first < len(tokens):
+        line_start = token_ends[first - 1] if first > 0 else 0
+        last = max(int(np.searchsorted(token_ends, line_start + 70, side="right")), first + 1)
+        lines.append("".join(tokens[first:last]))
+        first = last
+
+    return "\n".join(lines) + "\n"
+
+
+def _check_cells(cells: np.ndarray) -> None:
+    """
+    Raise an error unless cells is a non-empty 2D array.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+        raise ValueError("cells must be a non-empty 2D NumPy array.")
@@ -1,3 +1,33 @@
+from dataclasses import dataclass
+import numpy as np
+
 # GameBoard is a two-dimensional list of boolean variables
 # representing a single generation of a Game of Life board.
 GameBoard = list[list[bool]]
+
+
+@dataclass
+class CycleReport:
+    """
+    Describes a Game of Life run that has become periodic.
+
+    The board at generation `onset` reappears at generation `onset + period`,
+    and repeats every `period` generations from then on. A still life
+    (including a board where everything has died) has period 1.
+    """
+    onset: int = 0
+    period: int = 1
+
+
+@dataclass
+class EnsembleResult:
+    """
+    Summary statistics of many Game of Life runs from random initial boards.
+
+    Row i of `populations` is the number of live cells in generations
+    0 through num_gens of the board generated from seeds[i], and
+    final_hashes[i] fingerprints its final board (see hash_board_array()).
+    """
+    seeds: list[int]
+    populations: np.ndarray
+    final_hashes: list[bytes]
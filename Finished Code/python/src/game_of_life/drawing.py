@@ -1,3 +1,6 @@
+from collections.abc import Iterable
+import imageio
+import numpy as np
 import pygame
 from datatypes import GameBoard
 from functions import count_rows, count_cols
@@ -82,4 +85,114 @@ def draw_game_boards(boards: list[GameBoard], cell_width: int) -> list[pygame.Su
     for board in boards: 
         surfaces.append(draw_game_board(board, cell_width))
 
-    return surfaces
\ No newline at end of file
+    return surfaces
+
+
+# ------------------------- Array rasterizer -------------------------
+
+# Drawing a pygame circle per live cell and converting every Surface back to an
+# array is much slower than the vectorized engine that produces the boards. The
+# functions below build each frame as a uint8 (height, width, 3) array directly:
+# the frame buffer is viewed as a (rows, cell_width, cols, cell_width, 3) array,
+# so every cell is a cell_width x cell_width block that can be painted for all
+# cells at once by broadcasting the board against a cell sprite.
+
+DARK_GRAY = np.array([60, 60, 60], dtype=np.uint8)
+WHITE = np.array([255, 255, 255], dtype=np.uint8)
+
+
+def make_cell_sprite(cell_width: int, circle: bool = True) -> np.ndarray:
+    """
+    Build the mask of pixels that a live cell colours in.
+    Args:
+        cell_width (int): Pixel width of each cell.
+        circle (bool): If True, a circle like the one draw_game_board() draws; otherwise a full square.
+    Returns:
+        np.ndarray: Boolean array of shape (cell_width, cell_width).
+    """
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    if not circle:
+        return np.ones((cell_width, cell_width), dtype=bool)
+
+    # same centre and radius as draw_game_board()
+    scaling_factor = 0.8
+    radius = int(scaling_factor * (cell_width / 2))
+    centre = cell_width // 2
+    y, x = np.mgrid[0:cell_width, 0:cell_width]
+    sprite = (x - centre) ** 2 + (y - centre) ** 2 <= radius ** 2
+
+    # make sure that even tiny cells show up
+    sprite[centre, centre] = True
+    return sprite
+
+
+def rasterize_board(cells: np.ndarray, cell_width: int,
+                    sprite: np.ndarray | None = None,
+                    out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Draw a board array into an RGB frame without pygame.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+        cell_width (int): Pixel width of each cell.
+        sprite (np.ndarray | None): Mask from make_cell_sprite(); defaults to circles.
+        out (np.ndarray | None): Preallocated (height, width, 3) uint8 frame buffer to draw into.
+    Returns:
+        np.ndarray: The frame, as a (num_rows * cell_width, num_cols * cell_width, 3) uint8 array.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+        raise ValueError("cells must be a non-empty 2D NumPy array.")
+    if sprite is None:
+        sprite = make_cell_sprite(cell_width)
+    if sprite.shape != (cell_width, cell_width):
+        raise ValueError("sprite must have shape (cell_width, cell_width).")
+
+    num_rows, num_cols = cells.shape
+    shape = (num_rows * cell_width, num_cols * cell_width, 3)
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    elif out.shape != shape or out.dtype != np.uint8:
+        raise ValueError("out must be a uint8 array of shape " + str(shape) + ".")
+
+    # view the frame as one cell_width x cell_width block per cell
+    blocks = out.reshape(num_rows, cell_width, num_cols, cell_width, 3)
+    lit = (cells != 0)[:, np.newaxis, :, np.newaxis] & sprite[np.newaxis, :, np.newaxis, :]
+    blocks[...] = np.where(lit[..., np.newaxis], WHITE, DARK_GRAY)
+
+    return out
+
+
+def write_game_boards_video(boards: Iterable[np.ndarray], cell_width: int,
+                            video_path: str, fps: int = 10, circle: bool = True) -> int:
+    """
+    Rasterize boards one at a time and encode each frame as soon as it is drawn.
+
+    Boards may come from any iterable, including a generator that is still
+    simulating, and a single frame buffer is reused, so memory does not grow
+    with the number of frames.
+    Args:
+        boards (Iterable[np.ndarray]): Board arrays, all of the same shape.
+        cell_width (int): Pixel width of each cell.
+        video_path (str): Where to write the .mp4 file.
+        fps (int): Frames per second.
+        circle (bool): Draw cells as circles (True) or squares (False).
+    Returns:
+        int: Number of frames written.
+    """
+    sprite = make_cell_sprite(cell_width, circle)
+    frame = None
+    num_frames = 0
+
+    writer = imageio.get_writer(video_path, fps=fps, codec="libx264", quality=8)
+    try:
+        for cells in boards:
+            if frame is None:
+                frame = np.empty((cells.shape[0] * cell_width, cells.shape[1] * cell_width, 3), dtype=np.uint8)
+            rasterize_board(cells, cell_width, sprite, frame)
+            writer.append_data(frame)
+            num_frames += 1
+    finally:
+        writer.close()
+
+    return num_frames
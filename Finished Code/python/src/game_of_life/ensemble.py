@@ -0,0 +1,156 @@
+"""
+Run large ensembles of random Game of Life boards ("soups") in parallel.
+
+Gathering statistics over thousands of random initial boards by calling
+play_game_of_life() once per board keeps every board of every run. Here each
+worker process stacks all of its boards of the same size into one 3D array of
+shape (num_boards, num_rows, num_cols) and advances the whole stack one
+generation at a time, keeping only each board's population and, at the end,
+a fingerprint of its final state. The seeds are split among the processes the
+same way as in our other multiprocessing code: one contiguous slice per
+process, with results sent back through a Queue.
+"""
+
+import multiprocessing
+import queue
+import numpy as np
+from datatypes import EnsembleResult
+from fast_engine import hash_board_array, count_live_neighbors_array, apply_life_rules
+
+
+def random_board_array(seed: int, num_rows: int, num_cols: int, density: float = 0.5) -> np.ndarray:
+    """
+    Generate a reproducible random board.
+    Args:
+        seed (int): Seed for the random number generator.
+        num_rows (int): Number of rows.
+        num_cols (int): Number of columns.
+        density (float): Probability that each cell starts alive.
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s.
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.random((num_rows, num_cols)) < density).astype(np.uint8)
+
+
+def update_boards_stacked(stack: np.ndarray) -> np.ndarray:
+    """
+    Apply Game of Life rules for one generation to every board in a stack.
+    Args:
+        stack (np.ndarray): uint8 array of shape (num_boards, num_rows, num_cols).
+    Returns:
+        np.ndarray: The stack of next-generation boards.
+    """
+    if not isinstance(stack, np.ndarray) or stack.ndim != 3:
+        raise ValueError("stack must be a 3D NumPy array.")
+
+    # the fast engine's helpers count along the last two axes, so each board is padded on its own
+    return apply_life_rules(stack, count_live_neighbors_array(stack))
+
+
+def simulate_ensemble_section(jobs: list[tuple[int, int, int, int]], num_gens: int,
+                              density: float, out_q: multiprocessing.Queue) -> None:
+    """
+    Simulate a slice of the ensemble and send each board's summary to a Queue.
+    Args:
+        jobs: (global_index, seed, num_rows, num_cols) for every board in this slice.
+        num_gens (int): Number of generations to simulate.
+        density (float): Initial probability that a cell is alive.
+        out_q: Queue receiving (global_index, population_curve, final_hash) tuples.
+    """
+    # boards can only be stacked with boards of the same size
+    by_size: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for index, seed, num_rows, num_cols in jobs:
+        by_size.setdefault((num_rows, num_cols), []).append((index, seed))
+
+    for (num_rows, num_cols), group in by_size.items():
+        stack = np.stack([random_board_array(seed, num_rows, num_cols, density) for _, seed in group])
+
+        populations = np.zeros((len(group), num_gens + 1), dtype=np.int64)
+        populations[:, 0] = stack.sum(axis=(1, 2))
+        for gen in range(1, num_gens + 1):
+            stack = update_boards_stacked(stack)
+            populations[:, gen] = stack.sum(axis=(1, 2))
+
+        for k, (index, _) in enumerate(group):
+            out_q.put((index, populations[k], hash_board_array(stack[k])))
+
+
+def run_ensemble(seeds: list[int], board_sizes: tuple[int, int] | list[tuple[int, int]],
+                 num_gens: int, density: float = 0.5,
+                 num_procs: int | None = None) -> EnsembleResult:
+    """
+    Simulate one random board per seed across several processes and summarize the runs.
+    Args:
+        seeds (list[int]): One random seed per board.
+        board_sizes: A single (num_rows, num_cols) used for every board, or one size per seed.
+        num_gens (int): Number of generations to simulate.
+        density (float): Initial probability that a cell is alive.
+        num_procs (int | None): Number of processes; defaults to the number of cores.
+    Returns:
+        EnsembleResult: Population curves and final-board fingerprints, in the order of seeds.
+    """
+    if not isinstance(seeds, list) or len(seeds) == 0:
+        raise ValueError("seeds must be a non-empty list of integers.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("density must be between 0 and 1.")
+
+    if isinstance(board_sizes, tuple):
+        board_sizes = [board_sizes] * len(seeds)
+    if len(board_sizes) != len(seeds):
+        raise ValueError("board_sizes must be one (num_rows, num_cols) pair or one pair per seed.")
+    for num_rows, num_cols in board_sizes:
+        if num_rows <= 0 or num_cols <= 0:
+            raise ValueError("board sizes must be positive.")
+
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    num_procs = max(1, min(num_procs, len(seeds)))
+
+    jobs = []
+    for i in range(len(seeds)):
+        jobs.append((i, seeds[i], board_sizes[i][0], board_sizes[i][1]))
+
+    # give each process one contiguous slice of the jobs
+    chunk_size = len(jobs) // num_procs
+    out_q = multiprocessing.Queue()
+    procs = []
+    for p_index in range(num_procs):
+        start = p_index * chunk_size
+        end = len(jobs) if p_index == num_procs - 1 else start + chunk_size
+        p = multiprocessing.Process(target=simulate_ensemble_section,
+                                    args=(jobs[start:end], num_gens, density, out_q))
+        p.start()
+        procs.append(p)
+
+    # collect one summary per board before joining, so no worker blocks on a full queue
+    populations = np.zeros((len(seeds), num_gens + 1), dtype=np.int64)
+    final_hashes: list[bytes] = [b""] * len(seeds)
+    num_received = 0
+    try:
+        while num_received < len(seeds):
+            try:
+                index, curve, fingerprint = out_q.get(timeout=1.0)
+            except queue.Empty:
+                # a worker that died (e.g. killed, or raised) will never send the rest of its summaries
+                for p in procs:
+                    if p.exitcode is not None and p.exitcode != 0:
+                        raise RuntimeError("an ensemble worker exited with code " + str(p.exitcode)
+                                           + " after " + str(num_received) + " of " + str(len(seeds))
+                                           + " boards were reported.")
+                continue
+            populations[index] = curve
+            final_hashes[index] = fingerprint
+            num_received += 1
+    finally:
+        if num_received < len(seeds):
+            for p in procs:
+                if p.is_alive():
+                    p.terminate()
+
+    for p in procs:
+        p.join()
+
+    return EnsembleResult(seeds=list(seeds), populations=populations, final_hashes=final_hashes)
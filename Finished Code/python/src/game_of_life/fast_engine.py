@@ -0,0 +1,352 @@
+"""
+A vectorized Game of Life engine.
+
+functions.py updates the board one cell at a time, and every neighbor check
+re-validates the whole board, so a generation costs far more than the
+rows x cols cells it touches. Here a board is stored as a NumPy uint8 array
+(1 = alive, 0 = dead) and each generation is computed in one pass: we pad the
+board with a border of dead cells (matching in_field(), which treats everything
+off the board as dead), add up the eight shifted copies of it to get every
+cell's neighbor count at once, and then apply the rules to the whole array.
+
+Boards can be converted back to GameBoards, so the results still work with
+draw_game_boards().
+"""
+
+import hashlib
+import numpy as np
+from datatypes import GameBoard, CycleReport
+
+
+def board_to_array(board: GameBoard) -> np.ndarray:
+    """
+    Convert a GameBoard into a 2D uint8 array.
+    Args:
+        board (GameBoard): A rectangular 2D list of booleans.
+    Returns:
+        np.ndarray: Array of shape (num_rows, num_cols) with 1 for alive, 0 for dead.
+    """
+    if not isinstance(board, list) or len(board) == 0:
+        raise ValueError("board must be a non-empty 2D list.")
+
+    first_row_length = len(board[0])
+    for row in board:
+        if len(row) != first_row_length:
+            raise ValueError("Board is not rectangular.")
+
+    if first_row_length == 0:
+        raise ValueError("Error: board should have at least one column.")
+
+    return np.array(board, dtype=np.uint8)
+
+
+def array_to_board(cells: np.ndarray) -> GameBoard:
+    """
+    Convert a 2D array of live/dead cells back into a GameBoard.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+    Returns:
+        GameBoard: The same board as a 2D list of booleans.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2:
+        raise ValueError("cells must be a 2D NumPy array.")
+
+    return cells.astype(bool).tolist()
+
+
+def count_live_neighbors_array(cells: np.ndarray) -> np.ndarray:
+    """
+    Count the live neighbors of every cell at once.
+    Args:
+        cells (np.ndarray): uint8 array of 0s and 1s whose last two axes are the rows and columns,
+            e.g. one board of shape (num_rows, num_cols) or a stack of shape (num_boards, num_rows, num_cols).
+    Returns:
+        np.ndarray: uint8 array of the same shape holding each cell's live neighbor count.
+    """
+    num_rows, num_cols = cells.shape[-2:]
+
+    # surround every board by a ring of dead cells so that every shift below stays in bounds
+    padded = np.zeros(cells.shape[:-2] + (num_rows + 2, num_cols + 2), dtype=np.uint8)
+    padded[..., 1:-1, 1:-1] = cells
+
+    return count_live_neighbors_padded(padded)
+
+
+def count_live_neighbors_padded(padded: np.ndarray) -> np.ndarray:
+    """
+    Count the live neighbors of every interior cell of a board that already has a one-cell border.
+    Args:
+        padded (np.ndarray): uint8 array of 0s and 1s whose last two axes are the rows and columns, and
+            whose outer ring in those axes holds the cells just off the board.
+    Returns:
+        np.ndarray: uint8 array with the last two axes shrunk by 2 holding each interior cell's live neighbor count.
+    """
+    num_rows = padded.shape[-2] - 2
+    num_cols = padded.shape[-1] - 2
+
+    # add up the eight shifted copies of the board, one for each neighbor direction
+    counts = np.zeros(padded.shape[:-2] + (num_rows, num_cols), dtype=np.uint8)
+    for i in range(3):
+        for j in range(3):
+            if i != 1 or j != 1:
+                counts += padded[..., i:i + num_rows, j:j + num_cols]
+
+    return counts
+
+
+def apply_life_rules(cells: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Compute the next generation from the current cells and their live neighbor counts.
+    Args:
+        cells (np.ndarray): Array of 0s and 1s, of any shape.
+        counts (np.ndarray): Live neighbor counts, with the same shape as cells.
+    Returns:
+        np.ndarray: uint8 array of the same shape representing the next generation.
+    """
+    # a cell is alive next generation if it has 3 live neighbors,
+    # or if it is alive now and has 2 live neighbors
+    alive = cells.astype(bool)
+    next_alive = (counts == 3) | (alive & (counts == 2))
+
+    return next_alive.astype(np.uint8)
+
+
+def update_board_array(cells: np.ndarray) -> np.ndarray:
+    """
+    Apply Game of Life rules for one generation to a whole array.
+    Args:
+        cells (np.ndarray): 2D uint8 array of 0s and 1s.
+    Returns:
+        np.ndarray: A new uint8 array representing the next generation.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2:
+        raise ValueError("cells must be a 2D NumPy array.")
+
+    return apply_life_rules(cells, count_live_neighbors_array(cells))
+
+
+def play_game_of_life_arrays(initial_cells: np.ndarray, num_gens: int) -> list[np.ndarray]:
+    """
+    Simulate Game of Life on arrays for a given number of generations.
+    Args:
+        initial_cells (np.ndarray): The starting board as a 2D array of 0s and 1s.
+        num_gens (int): The number of generations to simulate.
+    Returns:
+        list[np.ndarray]: uint8 arrays from initial through num_gens generations.
+    """
+    if not isinstance(initial_cells, np.ndarray) or initial_cells.ndim != 2 or initial_cells.size == 0:
+        raise ValueError("initial_cells must be a non-empty 2D NumPy array.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    boards = [(initial_cells != 0).astype(np.uint8)]
+
+    for i in range(num_gens):
+        boards.append(update_board_array(boards[i]))
+
+    return boards
+
+
+def play_game_of_life_fast(initial_board: GameBoard, num_gens: int,
+                           stop_at_cycle: bool = False) -> list[GameBoard]:
+    """
+    Drop-in replacement for play_game_of_life() that uses the vectorized engine.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The number of generations to simulate.
+        stop_at_cycle (bool): If True, stop as soon as a board repeats (see play_game_of_life_until_cycle()).
+    Returns:
+        list[GameBoard]: Boards from initial through num_gens generations, or through the
+            first repeated board if stop_at_cycle is True and the run becomes periodic.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    if stop_at_cycle:
+        arrays, _ = play_game_of_life_until_cycle(board_to_array(initial_board), num_gens)
+    else:
+        arrays = play_game_of_life_arrays(board_to_array(initial_board), num_gens)
+
+    boards = []
+    for cells in arrays:
+        boards.append(array_to_board(cells))
+
+    return boards
+
+
+# ------------------------- Active-region updates -------------------------
+
+# In a mostly quiet board, a cell can only change if it or one of its neighbors
+# changed in the previous generation. The functions below keep the board padded
+# with a ring of dead cells and track the flat indices of the cells that changed
+# last generation, so each generation only re-evaluates those cells and their
+# neighbors instead of the whole board.
+
+
+def pad_board_array(cells: np.ndarray) -> np.ndarray:
+    """
+    Surround a board with a ring of dead cells for use with update_board_active().
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+    Returns:
+        np.ndarray: uint8 array with one more row/column of dead cells on every side.
+    """
+    if not isinstance(cells, np.ndarray) or cells.ndim != 2 or cells.size == 0:
+        raise ValueError("cells must be a non-empty 2D NumPy array.")
+
+    padded = np.zeros((cells.shape[0] + 2, cells.shape[1] + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = cells != 0
+
+    return padded
+
+
+def update_board_active(padded: np.ndarray, changed: np.ndarray | None,
+                        dense_fraction: float = 0.25) -> np.ndarray:
+    """
+    Advance a padded board by one generation in place, only visiting cells near last generation's changes.
+    Args:
+        padded (np.ndarray): Board from pad_board_array(); updated in place.
+        changed (np.ndarray | None): Flat indices into padded of the cells that changed in the
+            previous generation, or None if unknown (e.g., the first generation).
+        dense_fraction (float): If more than this fraction of the board needs re-evaluating,
+            update the whole board with update_board_array() instead.
+    Returns:
+        np.ndarray: Flat indices into padded of the cells that changed in this generation.
+    """
+    if not isinstance(padded, np.ndarray) or padded.ndim != 2 or padded.dtype != np.uint8:
+        raise ValueError("padded must be a 2D uint8 NumPy array from pad_board_array().")
+
+    num_rows = padded.shape[0] - 2
+    num_cols = padded.shape[1] - 2
+    width = padded.shape[1]
+
+    candidates = None
+    if changed is not None:
+        # every cell that changed, plus its eight neighbors
+        offsets = np.array([-width - 1, -width, -width + 1, -1, 0, 1, width - 1, width, width + 1])
+        candidates = np.unique((changed[:, np.newaxis] + offsets).ravel())
+
+        # cells in the dead border ring are never updated
+        rows = candidates // width
+        cols = candidates % width
+        on_board = (rows >= 1) & (rows <= num_rows) & (cols >= 1) & (cols <= num_cols)
+        candidates = candidates[on_board]
+
+    # dense fallback when activity is high (or unknown)
+    if candidates is None or len(candidates) > dense_fraction * num_rows * num_cols:
+        interior = padded[1:-1, 1:-1]
+        new_interior = update_board_array(interior)
+        rows, cols = np.nonzero(new_interior != interior)
+        interior[:] = new_interior
+        return (rows + 1) * width + (cols + 1)
+
+    # sparse path: gather each candidate's neighbors from the flattened board
+    flat = padded.ravel()
+    counts = np.zeros(len(candidates), dtype=np.uint8)
+    for offset in (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1):
+        counts += flat[candidates + offset]
+
+    alive = flat[candidates] == 1
+    next_alive = (counts == 3) | (alive & (counts == 2))
+
+    # all reads are done, so now it is safe to flip the cells that changed
+    changed_now = candidates[next_alive != alive]
+    flat[changed_now] ^= 1
+
+    return changed_now
+
+
+def play_game_of_life_active(initial_cells: np.ndarray, num_gens: int,
+                             frequency: int = 1,
+                             dense_fraction: float = 0.25) -> list[np.ndarray]:
+    """
+    Simulate Game of Life with active-region tracking.
+    Args:
+        initial_cells (np.ndarray): The starting board as a 2D array of 0s and 1s.
+        num_gens (int): The number of generations to simulate.
+        frequency (int): Keep a copy of every frequency-th generation (generation 0 included).
+        dense_fraction (float): See update_board_active().
+    Returns:
+        list[np.ndarray]: uint8 arrays for generations 0, frequency, 2*frequency, ... up to num_gens.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not isinstance(frequency, int) or frequency <= 0:
+        raise ValueError("frequency must be a positive integer.")
+
+    padded = pad_board_array(initial_cells)
+    boards = [padded[1:-1, 1:-1].copy()]
+
+    changed = None
+    for gen in range(1, num_gens + 1):
+        changed = update_board_active(padded, changed, dense_fraction)
+        if gen % frequency == 0:
+            boards.append(padded[1:-1, 1:-1].copy())
+
+    return boards
+
+
+# ------------------------- Cycle detection -------------------------
+
+
+def hash_board_array(cells: np.ndarray) -> bytes:
+    """
+    Compute a 128-bit fingerprint of a board from its bit-packed cells.
+    Args:
+        cells (np.ndarray): 2D array where nonzero means alive.
+    Returns:
+        bytes: A digest that is equal for equal boards (and, in practice, only for equal boards).
+    """
+    packed = np.packbits(cells != 0)
+    digest = hashlib.blake2b(packed.tobytes(), digest_size=16)
+    digest.update(str(cells.shape).encode())
+    return digest.digest()
+
+
+def play_game_of_life_until_cycle(initial_cells: np.ndarray, num_gens: int,
+                                  keep_boards: bool = True
+                                  ) -> tuple[list[np.ndarray], CycleReport | None]:
+    """
+    Simulate Game of Life, stopping early once the board becomes static or periodic.
+
+    Every generation is fingerprinted with hash_board_array(); as soon as a
+    fingerprint has been seen before, the run has entered a cycle and there is
+    nothing new left to simulate.
+    Args:
+        initial_cells (np.ndarray): The starting board as a 2D array of 0s and 1s.
+        num_gens (int): The maximum number of generations to simulate.
+        keep_boards (bool): If False, only the last board is returned, which is all
+            that statistics sweeps need.
+    Returns:
+        tuple[list[np.ndarray], CycleReport | None]: The boards from generation 0 up to the first
+            repeated board (or num_gens), and a CycleReport, or None if no cycle was found.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    padded = pad_board_array(initial_cells)
+    boards = [padded[1:-1, 1:-1].copy()]
+
+    # fingerprint -> first generation at which that board was seen
+    seen = {hash_board_array(padded[1:-1, 1:-1]): 0}
+
+    changed = None
+    for gen in range(1, num_gens + 1):
+        changed = update_board_active(padded, changed)
+
+        if keep_boards:
+            boards.append(padded[1:-1, 1:-1].copy())
+        else:
+            boards = [padded[1:-1, 1:-1].copy()]
+
+        # nothing changed, so we are at a still life; no need to hash
+        if len(changed) == 0:
+            return boards, CycleReport(onset=gen - 1, period=1)
+
+        fingerprint = hash_board_array(padded[1:-1, 1:-1])
+        if fingerprint in seen:
+            onset = seen[fingerprint]
+            return boards, CycleReport(onset=onset, period=gen - onset)
+        seen[fingerprint] = gen
+
+    return boards, None
@@ -0,0 +1,385 @@
+"""
+A HashLife engine for very long Game of Life runs.
+
+HashLife stores the (infinite) board as a quadtree: a node of level k is a
+2^k x 2^k square made of four level k-1 children, and level 0 nodes are single
+cells. Nodes are canonical, meaning that two squares with the same contents are
+the same Python object, so repeated structure (empty space, copies of a glider,
+a gun's repeating stream) is only stored once. Each node also memoizes its
+"successor": the central half of the square advanced 2^j generations. Since the
+successor only depends on the contents of the square, a result computed once is
+reused everywhere that square appears, at every later time, which is what lets
+us jump 2^k generations at once.
+
+The canonical-node table and the successor memo grow as the run proceeds, so
+they are bounded by max_nodes: when a jump leaves more than max_nodes nodes in
+the table, every node that is no longer part of the current board is evicted
+and the memo is cleared.
+
+Unlike play_game_of_life(), the board is unbounded; to_board() exports any
+rectangular window of it as a GameBoard for the existing drawing code.
+"""
+
+import numpy as np
+from datatypes import GameBoard
+from fast_engine import board_to_array
+
+
+class _Node:
+    """
+    A canonical quadtree node. Leaves (level 0) have no children and a
+    population of 0 or 1.
+    """
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    def __init__(self, nw: "_Node | None", ne: "_Node | None",
+                 sw: "_Node | None", se: "_Node | None",
+                 level: int, population: int):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+class HashLife:
+    """
+    A Game of Life board on the infinite plane, simulated with HashLife.
+
+    The initial board's top-left cell is placed at coordinates (0, 0) and the
+    board is dead everywhere outside of it. Coordinates are (row, col) pairs
+    that may be negative.
+    """
+
+    def __init__(self, initial_board: GameBoard, max_nodes: int = 1_000_000):
+        """
+        Args:
+            initial_board (GameBoard): The starting game board.
+            max_nodes (int): Number of canonical nodes above which unused nodes are evicted.
+        """
+        if not isinstance(max_nodes, int) or max_nodes <= 0:
+            raise ValueError("max_nodes must be a positive integer.")
+
+        cells = board_to_array(initial_board)
+
+        self.max_nodes = max_nodes
+        self.num_rows, self.num_cols = cells.shape
+        self.generation = 0
+
+        # canonical table: children -> node, and successor memo: (node, j) -> node
+        self._nodes: dict[tuple, _Node] = {}
+        self._results: dict[tuple[_Node, int], _Node] = {}
+
+        self._dead = _Node(None, None, None, None, 0, 0)
+        self._alive = _Node(None, None, None, None, 0, 1)
+        self._empty: list[_Node] = [self._dead]
+
+        # the root is a square centred on the origin that is large enough to contain the board
+        level = 3
+        while (1 << (level - 1)) < max(self.num_rows, self.num_cols):
+            level += 1
+        half = 1 << (level - 1)
+        self._root = self._build(cells, -half, -half, level)
+
+    # ------------------------- Public API -------------------------
+
+    @property
+    def population(self) -> int:
+        """
+        Number of live cells on the whole board.
+        """
+        return self._root.population
+
+    @property
+    def num_nodes(self) -> int:
+        """
+        Number of nodes currently in the canonical-node table.
+        """
+        return len(self._nodes)
+
+    def step(self, k: int) -> None:
+        """
+        Advance the board by 2^k generations in a single jump.
+        Args:
+            k (int): log2 of the number of generations to advance.
+        """
+        if not isinstance(k, int) or k < 0:
+            raise ValueError("k must be a non-negative integer.")
+
+        # grow the root until it is big enough for a jump of 2^k and every live cell sits in
+        # its central quarter, then add one more ring of empty space for the pattern to grow into
+        root = self._root
+        while root.level < max(k + 2, 3) or not self._is_padded(root):
+            root = self._expand(root)
+        root = self._expand(root)
+
+        # the successor is the central half of the root, so the board stays centred on the origin
+        self._root = self._successor(root, k)
+        self.generation += 1 << k
+
+        if len(self._nodes) > self.max_nodes:
+            self.collect_garbage()
+
+    def advance(self, num_gens: int) -> None:
+        """
+        Advance the board by num_gens generations, using one jump per set bit of num_gens.
+        Args:
+            num_gens (int): The number of generations to simulate.
+        """
+        if not isinstance(num_gens, int) or num_gens < 0:
+            raise ValueError("num_gens must be a non-negative integer.")
+
+        k = 0
+        while num_gens > 0:
+            if num_gens & 1:
+                self.step(k)
+            num_gens >>= 1
+            k += 1
+
+    def to_board(self, top: int = 0, left: int = 0,
+                 num_rows: int | None = None, num_cols: int | None = None) -> GameBoard:
+        """
+        Export a rectangular window of the board as a GameBoard.
+        Args:
+            top (int): Row coordinate of the window's top-left cell.
+            left (int): Column coordinate of the window's top-left cell.
+            num_rows (int | None): Window height; defaults to the initial board's height.
+            num_cols (int | None): Window width; defaults to the initial board's width.
+        Returns:
+            GameBoard: The cells inside the window.
+        """
+        if num_rows is None:
+            num_rows = self.num_rows
+        if num_cols is None:
+            num_cols = self.num_cols
+        if not isinstance(num_rows, int) or num_rows <= 0:
+            raise ValueError("num_rows must be a positive integer.")
+        if not isinstance(num_cols, int) or num_cols <= 0:
+            raise ValueError("num_cols must be a positive integer.")
+
+        window = np.zeros((num_rows, num_cols), dtype=bool)
+        half = 1 << (self._root.level - 1)
+        self._write(self._root, -half - top, -half - left, window)
+
+        return window.tolist()
+
+    def collect_garbage(self) -> None:
+        """
+        Evict every node that is not part of the current board and clear the successor memo.
+        """
+        keep: dict[tuple, _Node] = {}
+
+        # empty nodes are reused constantly, so they always stay canonical
+        for node in self._empty[1:]:
+            keep[(node.nw, node.ne, node.sw, node.se)] = node
+
+        stack = [self._root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in keep:
+                keep[key] = node
+                stack.extend(key)
+
+        self._nodes = keep
+        self._results = {}
+
+    # ------------------------- Quadtree construction -------------------------
+
+    def _join(self, nw: _Node, ne: _Node, sw: _Node, se: _Node) -> _Node:
+        """
+        Return the canonical node with the given four children.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = _Node(nw, ne, sw, se, nw.level + 1, population)
+            self._nodes[key] = node
+        return node
+
+    def _empty_node(self, level: int) -> _Node:
+        """
+        Return the canonical all-dead node of the given level.
+        """
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+        return self._empty[level]
+
+    def _build(self, cells: np.ndarray, top: int, left: int, level: int) -> _Node:
+        """
+        Build the node of the given level whose top-left cell is at (top, left),
+        reading live cells from an array whose top-left cell is at (0, 0).
+        """
+        size = 1 << level
+        r0, r1 = max(top, 0), min(top + size, cells.shape[0])
+        c0, c1 = max(left, 0), min(left + size, cells.shape[1])
+
+        # skip any square that misses the board or holds no live cells
+        if r0 >= r1 or c0 >= c1 or not cells[r0:r1, c0:c1].any():
+            return self._empty_node(level)
+
+        if level == 0:
+            return self._alive
+
+        half = size // 2
+        return self._join(
+            self._build(cells, top, left, level - 1),
+            self._build(cells, top, left + half, level - 1),
+            self._build(cells, top + half, left, level - 1),
+            self._build(cells, top + half, left + half, level - 1),
+        )
+
+    def _expand(self, node: _Node) -> _Node:
+        """
+        Return the node one level up that has `node` at its centre, surrounded by dead cells.
+        """
+        e = self._empty_node(node.level - 1)
+        return self._join(
+            self._join(e, e, e, node.nw),
+            self._join(e, e, node.ne, e),
+            self._join(e, node.sw, e, e),
+            self._join(node.se, e, e, e),
+        )
+
+    def _is_padded(self, node: _Node) -> bool:
+        """
+        Check whether all of a node's live cells lie in its central quarter.
+        """
+        return (node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    # ------------------------- Evolution -------------------------
+
+    def _centre(self, node: _Node) -> _Node:
+        """
+        Return the central half of a node, one level down, without advancing time.
+        """
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _life_4x4(self, node: _Node) -> _Node:
+        """
+        Advance the central 2x2 square of a level 2 node by one generation.
+        """
+        grid = [[0] * 4 for _ in range(4)]
+        for index, quad in enumerate((node.nw, node.ne, node.sw, node.se)):
+            r = (index // 2) * 2
+            c = (index % 2) * 2
+            grid[r][c] = quad.nw.population
+            grid[r][c + 1] = quad.ne.population
+            grid[r + 1][c] = quad.sw.population
+            grid[r + 1][c + 1] = quad.se.population
+
+        new_cells = []
+        for r in (1, 2):
+            for c in (1, 2):
+                count = -grid[r][c]
+                for i in range(r - 1, r + 2):
+                    for j in range(c - 1, c + 2):
+                        count += grid[i][j]
+                if count == 3 or (grid[r][c] == 1 and count == 2):
+                    new_cells.append(self._alive)
+                else:
+                    new_cells.append(self._dead)
+
+        return self._join(new_cells[0], new_cells[1], new_cells[2], new_cells[3])
+
+    def _successor(self, node: _Node, j: int) -> _Node:
+        """
+        Return the central half of a node of level k advanced by 2^j generations (j <= k - 2).
+        """
+        if node.population == 0:
+            return node.nw
+
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+
+            # nine overlapping squares of half the node's width
+            n00 = nw
+            n01 = self._join(nw.ne, ne.nw, nw.se, ne.sw)
+            n02 = ne
+            n10 = self._join(nw.sw, nw.se, sw.nw, sw.ne)
+            n11 = self._join(nw.se, ne.sw, sw.ne, se.nw)
+            n12 = self._join(ne.sw, ne.se, se.nw, se.ne)
+            n20 = sw
+            n21 = self._join(sw.ne, se.nw, sw.se, se.sw)
+            n22 = se
+
+            if j == node.level - 2:
+                # full-speed jump: advance 2^(j-1) generations twice
+                def first(n: _Node) -> _Node:
+                    return self._successor(n, j - 1)
+                second_j = j - 1
+            else:
+                # smaller jump: only take centres in the first half, advance 2^j in the second
+                def first(n: _Node) -> _Node:
+                    return self._centre(n)
+                second_j = j
+
+            r00, r01, r02 = first(n00), first(n01), first(n02)
+            r10, r11, r12 = first(n10), first(n11), first(n12)
+            r20, r21, r22 = first(n20), first(n21), first(n22)
+
+            result = self._join(
+                self._successor(self._join(r00, r01, r10, r11), second_j),
+                self._successor(self._join(r01, r02, r11, r12), second_j),
+                self._successor(self._join(r10, r11, r20, r21), second_j),
+                self._successor(self._join(r11, r12, r21, r22), second_j),
+            )
+
+        self._results[key] = result
+        return result
+
+    # ------------------------- Export -------------------------
+
+    def _write(self, node: _Node, top: int, left: int, window: np.ndarray) -> None:
+        """
+        Set the live cells of a node whose top-left corner is at (top, left) of the window.
+        """
+        size = 1 << node.level
+        if (node.population == 0 or top >= window.shape[0] or left >= window.shape[1]
+                or top + size <= 0 or left + size <= 0):
+            return
+
+        if node.level == 0:
+            window[top, left] = True
+            return
+
+        half = size // 2
+        self._write(node.nw, top, left, window)
+        self._write(node.ne, top, left + half, window)
+        self._write(node.sw, top + half, left, window)
+        self._write(node.se, top + half, left + half, window)
+
+
+def jump_game_of_life(initial_board: GameBoard, num_gens: int,
+                      max_nodes: int = 1_000_000) -> GameBoard:
+    """
+    Simulate Game of Life on the infinite plane with HashLife.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The number of generations to simulate.
+        max_nodes (int): Bound on the canonical-node cache.
+    Returns:
+        GameBoard: Generation num_gens, restricted to the initial board's window.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    universe = HashLife(initial_board, max_nodes)
+    universe.advance(num_gens)
+
+    return universe.to_board()
@@ -1,47 +1,31 @@
 import sys
-import pygame
-import numpy
 import imageio
-from custom_io import read_board_from_file
-from functions import play_game_of_life
-from drawing import draw_game_board, draw_game_boards
-
-
-def pygame_surface_to_numpy(surface: pygame.Surface) -> numpy.ndarray:
-    """
-    Convert a Pygame Surface to a NumPy RGB image array.
-    Returns:
-        numpy.ndarray: Frame as (height, width, 3) array.
-    """
-    return None  # TODO: implement
+from custom_io import read_board_array
+from fast_engine import play_game_of_life_arrays
+from drawing import rasterize_board, write_game_boards_video
 
 
 def main():
     print("Coding the Game of Life!")
 
-    # initialize pygame 
-    pygame.init()
-
     # read the board from file 
-    r_pentomino = read_board_from_file("boards/rPentomino.csv")
+    r_pentomino = read_board_array("boards/rPentomino.csv")
 
     cell_width = 20
 
-    surface = draw_game_board(r_pentomino, cell_width)
+    frame = rasterize_board(r_pentomino, cell_width)
 
-    print("We made the surface?")
+    print("We made the frame?")
 
     filename = "output/rPentomino.png"
 
-    pygame.image.save(surface, filename)
+    imageio.imwrite(filename, frame)
 
     print("Image created.")
 
     # when we type command line arguments, a tuple of strings is created called sys.argv
     # length of tuple is 1 more than # of arguments because the first one is always the name of the program, e.g., "main.py"
 
-    pygame.quit()
-
     if len(sys.argv) != 5:
         raise ValueError("Usage: python main.py initial_board.csv output_prefix cell_width num_gens")
     
@@ -56,47 +40,30 @@ def main():
     
     print("Reading in the initial Game of Life board.")
 
-    initial_board = read_board_from_file(input_csv)
+    # read_board_array() also understands .rle and packed .golb boards
+    initial_cells = read_board_array(input_csv)
 
     print("Board read successfully.")
 
     print("Playing Game of Life.")
 
-    boards = play_game_of_life(initial_board, num_gens)
+    # the vectorized engine gives the same boards as play_game_of_life(), just much faster
+    boards = play_game_of_life_arrays(initial_cells, num_gens)
 
     print("Game of Life simulation is finished!")
 
-    print("Drawing the Game boards to surfaces.")
-
-    surfaces = draw_game_boards(boards, cell_width)
-
-    print("Boards drawn to canvases.")
-
-    # we need a little bit more code to visualize the canvases that we have as an animation
+    print("Drawing the Game boards and encoding the animation.")
 
     video_path = output_prefix + ".mp4" # gives it the appropriate file extension 
 
-    # create a writer object to write to file 
-    writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality = 8)
-
-    # range over surface objects and draw each one 
-    for surface in surfaces:
-        # writer needs to convert the surface to a numpy array
-        frame = pygame_surface_to_numpy(surface)
-        writer.append_data(frame)
-
-    writer.close()
+    # each board is rasterized straight into a frame array and encoded right away,
+    # so we never hold more than one frame in memory
+    write_game_boards_video(boards, cell_width, video_path, fps=10)
 
     print("Success! MP4 video produced.")
 
-    pygame.image.save(surfaces[len(surfaces)-1], "output/test.png")
-
+    imageio.imwrite("output/test.png", rasterize_board(boards[len(boards)-1], cell_width))
 
-def pygame_surface_to_numpy(surface: pygame.Surface) -> numpy.ndarray:
-    """
-    Convert a Pygame surface to a NumPy RGB image array.
-    """
-    return pygame.surfarray.array3d(surface).swapaxes(0,1) 
 
 if __name__ == "__main__":
     main()
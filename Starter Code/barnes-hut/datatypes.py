@@ -79,22 +79,93 @@ class Node:
         return self.children is None or len(self.children) == 0
 
     def insert(self, s: Star) -> None:
-        # TODO: implement
-        pass
+        """
+        Insert a star into the subtree rooted at this node.
+
+        A leaf holds at most one real star. When a second star arrives, the leaf
+        splits into four children, both stars move down into them, and the node keeps
+        a dummy star with their total mass at their center of gravity. Internal nodes
+        update their dummy star and pass the new star on to the right child.
+        """
+        if self.is_leaf():
+            if self.star is None:
+                self.star = s
+                return
+
+            existing = self.star
+            if existing.position.x == s.position.x and existing.position.y == s.position.y:
+                # stars on the same spot can never be separated, so merge them in place
+                self.star = combine_stars(existing, s)
+                return
+
+            self.create_children()
+            self.find_child(existing).insert(existing)
+            self.find_child(s).insert(s)
+            self.star = combine_stars(existing, s)
+            return
+
+        self.star = combine_stars(self.star, s)
+        self.find_child(s).insert(s)
 
     def create_children(self) -> None:
-        # TODO: implement
-        pass
+        """
+        Split this node's sector into four equal children, ordered [NW, NE, SW, SE].
+        """
+        x, y = self.sector.x, self.sector.y
+        w = self.sector.width / 2
+        self.children = [
+            Node(sector=Quadrant(x, y + w, w)),      # NW
+            Node(sector=Quadrant(x + w, y + w, w)),  # NE
+            Node(sector=Quadrant(x, y, w)),          # SW
+            Node(sector=Quadrant(x + w, y, w)),      # SE
+        ]
 
     # find_child determines the correct quadrant child a star belongs to
     # and returns that child node.
     def find_child(self, s: Star) -> 'Node':
-        # TODO: implement
-        pass
+        mid_x = self.sector.x + self.sector.width / 2
+        mid_y = self.sector.y + self.sector.width / 2
+
+        east = s.position.x >= mid_x
+        north = s.position.y >= mid_y
+        if north:
+            return self.children[1] if east else self.children[0]
+        return self.children[3] if east else self.children[2]
+
+    def contains(self, p: OrderedPair) -> bool:
+        """
+        Check if a point lies within this node's sector.
+        """
+        return (self.sector.x <= p.x <= self.sector.x + self.sector.width
+                and self.sector.y <= p.y <= self.sector.y + self.sector.width)
 
     def calculate_net_force(self, s: Star, theta: float) -> OrderedPair:
-        # TODO: implement
-        pass
+        """
+        Compute the net force on s from the stars in this subtree.
+
+        A sector that is far enough from s (its width over its distance to s is
+        below theta) and doesn't contain s acts as a single body at its center of
+        gravity; otherwise we add up the forces from its children.
+        """
+        if self.star is None or self.star is s:
+            return OrderedPair(0.0, 0.0)
+
+        d = distance(self.star.position, s.position)
+
+        if self.is_leaf():
+            if d == 0.0:
+                return OrderedPair(0.0, 0.0)
+            return compute_force(self.star, s)
+
+        if d > 0.0 and self.sector.width / d < theta and not self.contains(s.position):
+            return compute_force(self.star, s)
+
+        net = OrderedPair(0.0, 0.0)
+        for child in self.children:
+            force = child.calculate_net_force(s, theta)
+            net.x += force.x
+            net.y += force.y
+        return net
 
 @dataclass
 class QuadTree:
@@ -112,8 +183,36 @@ class QuadTree:
 # To prevent circular import issues, we define these functions here.
 
 def center_of_gravity(*stars: Star) -> OrderedPair:
-    # TODO: implement
-    pass
+    """
+    Compute the mass-weighted average position of the given stars.
+    Falls back to the plain average position if they have no mass.
+    """
+    total_mass = 0.0
+    x = 0.0
+    y = 0.0
+    for s in stars:
+        total_mass += s.mass
+        x += s.mass * s.position.x
+        y += s.mass * s.position.y
+
+    if total_mass == 0.0:
+        return OrderedPair(sum(s.position.x for s in stars) / len(stars),
+                           sum(s.position.y for s in stars) / len(stars))
+
+    return OrderedPair(x / total_mass, y / total_mass)
+
+
+def combine_stars(s1: Star, s2: Star) -> Star:
+    """
+    Create the dummy star a quadtree node uses to stand in for s1 and s2:
+    their total mass, placed at their center of gravity.
+    """
+    return Star(
+        position=center_of_gravity(s1, s2),
+        velocity=OrderedPair(0.0, 0.0),
+        acceleration=OrderedPair(0.0, 0.0),
+        mass=s1.mass + s2.mass,
+    )
 
 
 def compute_force(s1: Star, s2: Star) -> OrderedPair:
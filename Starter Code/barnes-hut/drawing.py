@@ -1,4 +1,6 @@
+import numpy as np
 import pygame
+from collections.abc import Iterator
 from datatypes import Universe
 from engine import barnes_hut_stream
 
@@ -23,6 +25,23 @@ def animate_system(
 
     return images
 
+
+def animate_system_stream(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    canvas_width: int,
+    frequency: int,
+    scaling_factor: float
+) -> Iterator[pygame.Surface]:
+    """
+    Run the double-buffered Barnes–Hut engine and yield one Pygame surface
+    every `frequency` steps, drawing each snapshot as soon as it is produced.
+    """
+    for universe in barnes_hut_stream(initial_universe, num_gens, time, theta, frequency):
+        yield draw_to_canvas(universe, canvas_width, scaling_factor)
+
 import pygame
 
 def draw_to_canvas(universe, canvas_width: int, scaling_factor: float) -> pygame.Surface:
@@ -43,4 +62,109 @@ def draw_to_canvas(universe, canvas_width: int, scaling_factor: float) -> pygame
         r = max(1, int(scaling_factor * (star.radius / universe.width) * canvas_width))
         pygame.draw.circle(surface, color, (cx, cy), r)
 
-    return surface
\ No newline at end of file
+    return surface
+
+
+def animate_system_density_stream(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    canvas_width: int,
+    frequency: int,
+    log_scale: bool = True,
+    color_by_mass: bool = False
+) -> Iterator[np.ndarray]:
+    """
+    Like animate_system_stream(), but renders every snapshot with draw_density()
+    and yields the frames as uint8 arrays ready for imageio.
+    """
+    for universe in barnes_hut_stream(initial_universe, num_gens, time, theta, frequency):
+        yield draw_density(universe, canvas_width, log_scale, color_by_mass)
+
+
+# colors that pixels holding light, medium and heavy bodies fade between when draw_density()
+# colors by mass: from the lightest mass on the canvas (blue) to the heaviest (orange-red)
+MASS_COLORMAP = np.array([
+    (70, 110, 255),
+    (255, 255, 255),
+    (255, 90, 30),
+], dtype=np.float64)
+
+
+def draw_density(
+    universe: Universe,
+    canvas_width: int,
+    log_scale: bool = True,
+    color_by_mass: bool = False
+) -> np.ndarray:
+    """
+    Render the universe as a density image of shape (canvas_width, canvas_width, 3).
+
+    Instead of drawing a circle per star, star positions are binned into a 2D
+    histogram with one bin per pixel. A pixel's brightness comes from the number
+    of stars in it, optionally log-scaled. Its colour is the average colour of its
+    stars or, if color_by_mass is True, the average mass of its stars mapped through
+    MASS_COLORMAP on a log scale, so heavy bodies such as black holes stand out.
+    No pygame calls are made, so the frame can go straight to imageio.
+    """
+    if not isinstance(canvas_width, int) or canvas_width <= 0:
+        raise ValueError("canvas_width must be a positive integer.")
+
+    frame = np.zeros((canvas_width, canvas_width, 3), dtype=np.uint8)
+
+    if universe.stars is None or len(universe.stars) == 0:
+        return frame
+
+    stars = universe.stars
+    n = len(stars)
+
+    # pull the per-star data out into flat arrays once
+    xs = np.fromiter((s.position.x for s in stars), dtype=np.float64, count=n)
+    ys = np.fromiter((s.position.y for s in stars), dtype=np.float64, count=n)
+    if color_by_mass:
+        masses = np.fromiter((s.mass for s in stars), dtype=np.float64, count=n)
+    else:
+        colors = np.array([(s.red, s.green, s.blue) for s in stars], dtype=np.float64)
+
+    # same mapping from universe to canvas coordinates as draw_to_canvas()
+    cols = np.floor(xs / universe.width * canvas_width).astype(np.int64)
+    rows = np.floor(ys / universe.width * canvas_width).astype(np.int64)
+
+    # stars that have drifted off the canvas are not drawn
+    on_canvas = (cols >= 0) & (cols < canvas_width) & (rows >= 0) & (rows < canvas_width)
+    if not np.any(on_canvas):
+        return frame
+
+    pixel = rows[on_canvas] * canvas_width + cols[on_canvas]
+
+    num_pixels = canvas_width * canvas_width
+    density = np.bincount(pixel, minlength=num_pixels).astype(np.float64)
+    occupied = density > 0
+
+    tint = np.zeros((num_pixels, 3))
+    if color_by_mass:
+        # average mass of the stars in each pixel, placed between the lightest and heaviest on a log scale
+        mean_mass = np.bincount(pixel, weights=masses[on_canvas], minlength=num_pixels)[occupied]
+        mean_mass /= density[occupied]
+        log_mass = np.log10(np.maximum(mean_mass, np.finfo(np.float64).tiny))
+        spread = log_mass.max() - log_mass.min()
+        level = (log_mass - log_mass.min()) / spread if spread > 0 else np.zeros_like(log_mass)
+
+        stops = np.linspace(0.0, 1.0, len(MASS_COLORMAP))
+        for k in range(3):
+            tint[occupied, k] = np.interp(level, stops, MASS_COLORMAP[:, k])
+    else:
+        # average colour of the stars in each pixel
+        colors = colors[on_canvas]
+        for k in range(3):
+            tint[:, k] = np.bincount(pixel, weights=colors[:, k], minlength=num_pixels)
+        tint[occupied] /= density[occupied, np.newaxis]
+
+    brightness = np.log1p(density) if log_scale else density
+    if brightness.max() > 0:
+        brightness = brightness / brightness.max()
+
+    image = tint * brightness[:, np.newaxis]
+    frame[:] = np.clip(image, 0, 255).astype(np.uint8).reshape(canvas_width, canvas_width, 3)
+    return frame
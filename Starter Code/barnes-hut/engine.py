@@ -1,6 +1,8 @@
 import math
+from collections.abc import Iterator
 from datatypes import OrderedPair, Universe, QuadTree, Node, Quadrant, Star, distance, compute_force, center_of_gravity
 from copy import deepcopy
+import numpy as np
 
 
 def barnes_hut(
@@ -9,8 +11,153 @@ def barnes_hut(
     time: float,
     theta: float
 ) -> list[Universe]:
-    # TODO: implement
-    pass
+    """
+    Run the Barnes–Hut simulation for num_gens generations and return every
+    generation, starting with the initial universe.
+    """
+    time_points = [initial_universe]
+
+    for i in range(num_gens):
+        time_points.append(update_universe(time_points[i], time, theta))
+
+    return time_points
+
+
+def barnes_hut_stream(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    frequency: int = 1
+) -> Iterator[Universe]:
+    """
+    Run the Barnes–Hut simulation with double-buffered star state and yield a
+    snapshot of the universe every `frequency` generations (generation 0 included).
+
+    barnes_hut() keeps a full Universe for every one of the num_gens generations.
+    Here the positions, velocities and accelerations of all stars live in three
+    NumPy arrays of shape (2, num_stars, 2): index 0 or 1 of the first axis is the
+    current generation and the other one receives the next, and the two swap roles
+    each generation. Star/OrderedPair objects are only created for the snapshots
+    that are yielded (about num_gens // frequency + 1 of them).
+    """
+    if initial_universe is None or initial_universe.stars is None:
+        raise ValueError("initial_universe must contain a list of stars.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not isinstance(frequency, int) or frequency <= 0:
+        raise ValueError("frequency must be a positive integer.")
+
+    return _barnes_hut_stream(initial_universe, num_gens, time, theta, frequency)
+
+
+def _barnes_hut_stream(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    frequency: int
+) -> Iterator[Universe]:
+    """
+    Generator behind barnes_hut_stream(), which validates its arguments up front.
+    """
+    stars = initial_universe.stars
+    n = len(stars)
+
+    # the two buffers of every quantity; buffer `front` holds the current generation
+    positions = np.zeros((2, n, 2))
+    velocities = np.zeros((2, n, 2))
+    accelerations = np.zeros((2, n, 2))
+    for i, s in enumerate(stars):
+        positions[0, i] = (s.position.x, s.position.y)
+        velocities[0, i] = (s.velocity.x, s.velocity.y)
+        accelerations[0, i] = (s.acceleration.x, s.acceleration.y)
+
+    # one set of Star objects, whose positions are refreshed every generation to build the quadtree
+    bodies = copy_universe(initial_universe)
+
+    front = 0
+    yield snapshot_universe(initial_universe, positions[front], velocities[front], accelerations[front])
+
+    for gen in range(1, num_gens + 1):
+        update_state_buffered(bodies, positions, velocities, accelerations, front, time, theta)
+
+        # the freshly written buffer becomes the current generation
+        front = 1 - front
+
+        if gen % frequency == 0:
+            yield snapshot_universe(initial_universe, positions[front], velocities[front], accelerations[front])
+
+
+def update_state_buffered(
+    bodies: Universe,
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    accelerations: np.ndarray,
+    source: int,
+    time: float,
+    theta: float
+) -> None:
+    """
+    Write the generation after buffer `source` into the other buffer (1 - source).
+
+    positions, velocities and accelerations have shape (2, num_stars, 2). `bodies`
+    holds one Star per row; their positions are overwritten with buffer `source` so
+    the quadtree can be built from them, and nothing else about them is used.
+    """
+    target = 1 - source
+
+    for s, (x, y) in zip(bodies.stars, positions[source].tolist()):
+        s.position.x = x
+        s.position.y = y
+
+    q = generate_quadtree(bodies)
+
+    for i, s in enumerate(bodies.stars):
+        new_accel = update_acceleration(s, q, theta)
+        accelerations[target, i, 0] = new_accel.x
+        accelerations[target, i, 1] = new_accel.y
+
+    old_accel = accelerations[source]
+    old_vel = velocities[source]
+
+    # same trapezoidal/constant-acceleration rules as update_velocity() and update_position(),
+    # applied to all stars at once
+    np.add(old_accel, accelerations[target], out=velocities[target])
+    velocities[target] *= 0.5 * time
+    velocities[target] += old_vel
+
+    np.multiply(old_accel, 0.5 * time * time, out=positions[target])
+    positions[target] += old_vel * time
+    positions[target] += positions[source]
+
+
+def snapshot_universe(
+    template: Universe,
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    accelerations: np.ndarray
+) -> Universe:
+    """
+    Build a fresh Universe from one buffer of state arrays, taking the width and
+    every star's mass, radius and color from `template`.
+    """
+    new_stars: list[Star] = []
+
+    for s, (px, py), (vx, vy), (ax, ay) in zip(template.stars, positions.tolist(),
+                                               velocities.tolist(), accelerations.tolist()):
+        new_stars.append(Star(
+            position=OrderedPair(px, py),
+            velocity=OrderedPair(vx, vy),
+            acceleration=OrderedPair(ax, ay),
+            mass=s.mass,
+            radius=s.radius,
+            red=s.red,
+            green=s.green,
+            blue=s.blue,
+        ))
+
+    return Universe(width=template.width, stars=new_stars)
 
 
 def update_universe(
@@ -18,12 +165,37 @@ def update_universe(
     time: float,
     theta: float
 ) -> Universe:
-    # TODO: implement
-    pass
+    """
+    Compute the next generation of the universe with a quadtree built from the
+    current one. The current universe is left unchanged.
+    """
+    new_universe = copy_universe(current_universe)
+    q = generate_quadtree(current_universe)
+
+    for old_star, star in zip(current_universe.stars, new_universe.stars):
+        old_accel = star.acceleration
+        old_vel = star.velocity
+
+        # forces are computed from the star that actually lives in the quadtree
+        star.acceleration = update_acceleration(old_star, q, theta)
+        star.velocity = update_velocity(star, time, old_accel)
+        star.position = update_position(star, time, old_accel, old_vel)
+
+    return new_universe
 
 def generate_quadtree(universe: Universe) -> QuadTree:
-    # TODO: implement
-    pass
+    """
+    Build a quadtree over the square universe from every star inside it.
+    Stars that have left the universe are not inserted, but still feel its forces.
+    """
+    root = Node(sector=Quadrant(0.0, 0.0, universe.width))
+    q = QuadTree(root=root)
+
+    for s in universe.stars:
+        if universe.in_field(s.position):
+            q.insert(s)
+
+    return q
 
 G = 6.67408e-11  # gravitational constant (you can scale this for visualization)
 
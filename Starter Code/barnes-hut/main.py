@@ -5,10 +5,11 @@ import time
 import pygame.surfarray
 
 from initialization import initialize_galaxy, initialize_universe, push
-from engine import barnes_hut
-from drawing import animate_system
+from drawing import animate_system_stream, animate_system_density_stream
 from datatypes import OrderedPair
 
+RENDERERS = ("circles", "density", "density-mass")
+
 
 def surface_to_array(surface: pygame.Surface) -> np.ndarray:
     """Convert a Pygame Surface to a NumPy array suitable for imageio."""
@@ -16,10 +17,12 @@ def surface_to_array(surface: pygame.Surface) -> np.ndarray:
 
 
 def main():
-    # Expect: python main.py num_stars num_gens time_interval theta canvas_width frequency
-    if len(sys.argv) != 7:
+    # Expect: python main.py num_stars num_gens time_interval theta canvas_width frequency [renderer]
+    # where renderer is "circles" (the default), "density", or "density-mass"
+    if len(sys.argv) not in (7, 8) or (len(sys.argv) == 8 and sys.argv[7] not in RENDERERS):
         raise ValueError(
-            "Usage: python main.py <num_stars> <num_gens> <time_interval> <theta> <canvas_width> <frequency>\n"
+            "Usage: python main.py <num_stars> <num_gens> <time_interval> <theta> <canvas_width> <frequency> "
+            "[circles|density|density-mass]\n"
             "Example: python main.py 100 10000 4e16 1.0 1000 100"
         )
 
@@ -29,6 +32,7 @@ def main():
     theta = float(sys.argv[4])
     canvas_width = int(sys.argv[5])
     frequency = int(sys.argv[6])
+    renderer = sys.argv[7] if len(sys.argv) == 8 else "circles"
 
     # Basic type sanity check (optional clarity for beginners)
     if not all(isinstance(v, int) for v in [num_stars, num_gens, canvas_width, frequency]):
@@ -46,20 +50,30 @@ def main():
     galaxies = [g0, g1]
     initial_universe = initialize_universe(galaxies, width)
 
-    # --- run simulation ---
-    start = time.time()
-    time_points = barnes_hut(initial_universe, num_gens, time_interval, theta)
-    print(f"Simulation complete in {time.time() - start:.2f}s")
-
-    # --- draw and render ---
-    scaling_factor = 1e11  # could later also be a CLI argument if desired
-    image_list = animate_system(time_points, canvas_width, frequency, scaling_factor)
+    # --- run simulation, drawing and rendering frames as they are produced ---
+    # only every `frequency`-th generation is ever copied out of the engine's two
+    # state buffers, so memory no longer grows with num_gens
+    if renderer == "circles":
+        scaling_factor = 1e11  # could later also be a CLI argument if desired
+        surfaces = animate_system_stream(
+            initial_universe, num_gens, time_interval, theta,
+            canvas_width, frequency, scaling_factor
+        )
+        frames = (surface_to_array(surface) for surface in surfaces)
+    else:
+        # density frames are already uint8 arrays, so pygame is not involved
+        frames = animate_system_density_stream(
+            initial_universe, num_gens, time_interval, theta,
+            canvas_width, frequency, color_by_mass=(renderer == "density-mass")
+        )
 
     output_filename = "galaxy.mp4"
     fps = 30
+    start = time.time()
     with imageio.get_writer(output_filename, fps=fps, codec="libx264") as writer:
-        for surface in image_list:
-            writer.append_data(surface_to_array(surface))
+        for frame in frames:
+            writer.append_data(frame)
+    print(f"Simulation and rendering complete in {time.time() - start:.2f}s")
     print("Saved video as galaxy.mp4")
 
 
@@ -1,6 +1,16 @@
+import numpy as np
+
 # Cell contains two attributes corresponding to
-# the concentration of predator (0-th element) and prey (1-th element) in the cell
+# the concentration of prey (0-th element) and predator (1-th element) in the cell
 Cell = tuple[float, float]
 
 # Board is a two-dimensional slice of Cells
 Board = list[list[Cell]]
+
+
+# arrays_to_board combines prey and predator arrays back into a Board of (prey, predator) tuples.
+def arrays_to_board(prey: np.ndarray, predator: np.ndarray) -> Board:
+    board: Board = []
+    for prey_row, predator_row in zip(prey.tolist(), predator.tolist()):
+        board.append(list(zip(prey_row, predator_row)))
+    return board
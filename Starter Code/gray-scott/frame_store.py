@@ -0,0 +1,80 @@
+import numpy as np
+from datatypes import Board, arrays_to_board
+
+# A FrameStore keeps sampled generations of a Gray-Scott simulation as one
+# array of shape (num_frames, 2, num_rows, num_cols), where [i, 0] holds the prey
+# and [i, 1] the predator concentrations of frame i. Compared to a list of Boards,
+# which stores every concentration as a Python float inside a tuple, a float32
+# frame takes 8 bytes per cell and a float16 frame 4 bytes, which is plenty of
+# precision for drawing. With a path, the array is a memory-mapped .npy file, so
+# frames are written to disk as they are produced and only the frames being
+# read are ever in memory; FrameStore.open() maps a saved file again later.
+#
+# Indexing a FrameStore gives Boards, so it can be handed to draw_boards() in
+# place of a list of Boards.
+
+
+class FrameStore:
+    # FrameStore creates room for num_frames frames of num_rows x num_cols cells,
+    # in memory or, if path is given, in a .npy file at that path.
+    def __init__(self, num_frames: int, num_rows: int, num_cols: int,
+                 dtype: np.dtype = np.float32, path: str | None = None):
+        if num_frames <= 0 or num_rows <= 0 or num_cols <= 0:
+            raise ValueError("num_frames, num_rows and num_cols must be positive.")
+        if np.dtype(dtype) not in (np.dtype(np.float16), np.dtype(np.float32), np.dtype(np.float64)):
+            raise ValueError("dtype must be float16, float32 or float64.")
+
+        shape = (num_frames, 2, num_rows, num_cols)
+        if path is None:
+            self.frames = np.zeros(shape, dtype=dtype)
+        else:
+            self.frames = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        self.path = path
+        self.num_written = 0
+
+    # open maps a FrameStore saved at path back into memory, read-only.
+    @classmethod
+    def open(cls, path: str) -> "FrameStore":
+        store = cls.__new__(cls)
+        store.frames = np.load(path, mmap_mode="r")
+        if store.frames.ndim != 4 or store.frames.shape[1] != 2:
+            raise ValueError(path + " does not hold Gray-Scott frames.")
+        store.path = path
+        store.num_written = store.frames.shape[0]
+        return store
+
+    # append stores the next frame, converting it to the store's dtype.
+    def append(self, prey: np.ndarray, predator: np.ndarray) -> None:
+        if self.num_written == self.frames.shape[0]:
+            raise ValueError("the FrameStore is full.")
+        self.frames[self.num_written, 0] = prey
+        self.frames[self.num_written, 1] = predator
+        self.num_written += 1
+
+    # flush makes sure every frame written so far is on disk (no-op in memory).
+    def flush(self) -> None:
+        if isinstance(self.frames, np.memmap):
+            self.frames.flush()
+
+    # arrays returns the prey and predator arrays of frame i, without copying.
+    def arrays(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        return self.frames[self._index(i), 0], self.frames[self._index(i), 1]
+
+    def __len__(self) -> int:
+        return self.num_written
+
+    # indexing a FrameStore converts frame i to a Board of (prey, predator) tuples.
+    def __getitem__(self, i: int) -> Board:
+        prey, predator = self.arrays(i)
+        return arrays_to_board(prey, predator)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self.num_written
+        if not 0 <= i < self.num_written:
+            raise IndexError("frame " + str(i) + " is not in the FrameStore.")
+        return i
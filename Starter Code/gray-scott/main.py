@@ -46,7 +46,7 @@ def main():
     # make prey = 1 everywhere
     for i in range(len(initial_board)):
         for j in range(len(initial_board[i])):
-            initial_board[r][c] = (1, initial_board[r][c][1])
+            initial_board[i][j] = (1, initial_board[i][j][1])
 
     # parameters
     num_gens = 8000
@@ -60,6 +60,10 @@ def main():
         [0.05, 0.2, 0.05],
     ])
 
+    # for visualization: we only draw every n-th board, so those are the only ones we keep
+    n = 100
+    cell_width = 1
+
     print("Starting simulation...")
     boards = simulate_gray_scott(
         initial_board,
@@ -69,16 +73,15 @@ def main():
         prey_diffusion_rate=0.2,
         predator_diffusion_rate=0.1,
         kernel=kernel,
+        stride=n,
+        dtype=np.float32,  # single precision draws the same, and is faster on bigger boards
     )
     print("Simulation complete!")
 
     print("Drawing boards to file")
 
-    # for visualization
-    n = 100
-    cell_width = 1
-
-    surfaces = draw_boards(boards, cell_width, n)
+    # boards already holds every n-th generation only, so draw all of them
+    surfaces = draw_boards(boards, cell_width, 1)
 
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
@@ -5,6 +5,39 @@ Board : list[list[int]]
     A 2-D grid of integers representing sand heights at each cell. Each inner
     list represents a row of the board, and each integer gives the number of
     grains in that cell.
+
+ToppleStats
+    Counts of how much toppling it took to stabilize a board.
 """
 
-Board = list[list[int]]  
\ No newline at end of file
+from dataclasses import dataclass
+import numpy as np
+
+Board = list[list[int]]
+
+
+@dataclass
+class ToppleStats:
+    """How much toppling it took to stabilize a board.
+
+    Attributes:
+        topple_counts: Number of times each cell toppled, with the board's shape.
+        num_rounds: Number of rounds (generations) of simultaneous toppling.
+        grains_lost: Grains that fell off the edge of the board.
+        performed_topples: Topples actually carried out, when a staged method reaches
+            the same stable board with fewer topples than total_topples; None otherwise.
+    """
+    topple_counts: np.ndarray
+    num_rounds: int
+    grains_lost: int
+    performed_topples: int | None = None
+
+    @property
+    def total_topples(self) -> int:
+        """Total number of topples over all cells."""
+        return int(self.topple_counts.sum())
+
+    @property
+    def max_topples(self) -> int:
+        """Largest number of topples of any one cell."""
+        return int(self.topple_counts.max())
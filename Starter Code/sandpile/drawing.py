@@ -1,14 +1,124 @@
 import os
-from multiprocessing import Process, Queue
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from multiprocessing import Process, Queue, shared_memory
 import math
+import queue
+import traceback
+import imageio
 import numpy as np
 import pygame
 from datatypes import Board
 
+# colors of cells holding 0, 1, 2 and 3 grains; unstable cells shade from white to red
+DARK_GRAY = (30, 30, 30)
+GRAY = (95, 95, 95)
+LIGHT_GRAY = (190, 190, 190)
+WHITE = (255, 255, 255)
+
+# the unstable colors stop changing once the green channel reaches 0 at 3 + 2^(255/40) grains
+PALETTE_SIZE = 96
+
+
+def make_palette() -> np.ndarray:
+    """Build the table of colors that draw_to_image() uses, indexed by grain count.
+
+    Returns:
+        uint8 array of shape (PALETTE_SIZE, 3); counts of PALETTE_SIZE - 1 or more
+        all share the last color.
+    """
+    palette = np.zeros((PALETTE_SIZE, 3), dtype=np.uint8)
+    palette[0] = DARK_GRAY
+    palette[1] = GRAY
+    palette[2] = LIGHT_GRAY
+    palette[3] = WHITE
+    for val in range(4, PALETTE_SIZE):
+        t = float(val - 3)
+        palette[val] = (
+            255,
+            int(255 - min(255, 40 * math.log2(t))),
+            int(255 - min(255, 80 * math.log2(t))),
+        )
+    return palette
+
+
+PALETTE = make_palette()
+
+
+def make_cell_mask(cell_width: int) -> np.ndarray:
+    """Return the pixels of one cell covered by the circle that draw_to_image() draws.
+
+    The circle is drawn once with pygame, so the mask matches its rasterization exactly.
+
+    Args:
+        cell_width: The width/height in pixels of each cell.
+
+    Returns:
+        Boolean array of shape (cell_width, cell_width).
+    """
+    surface = pygame.Surface((cell_width, cell_width))
+    surface.fill((0, 0, 0))
+    radius = int(0.8 * (cell_width / 2.0))
+    pygame.draw.circle(surface, (255, 255, 255), (cell_width // 2, cell_width // 2), radius)
+    return pygame.surfarray.array3d(surface)[:, :, 0].T > 0
+
+
+def make_cell_tiles(cell_width: int) -> np.ndarray:
+    """Pre-render one cell for every color of the palette.
+
+    Args:
+        cell_width: The width/height in pixels of each cell.
+
+    Returns:
+        uint8 array of shape (PALETTE_SIZE, cell_width, cell_width, 3), where tile v is
+        a cell holding v grains: a circle of color PALETTE[v] on the background.
+    """
+    mask = make_cell_mask(cell_width)
+    return np.where(mask[None, :, :, None], PALETTE[:, None, None, :], np.array(DARK_GRAY, dtype=np.uint8))
+
+
+def render_board(cells: np.ndarray, cell_width: int, out: np.ndarray | None = None,
+                 tiles: np.ndarray | None = None) -> np.ndarray:
+    """Draw a board like draw_to_image(), using array operations instead of one pygame call per cell.
+
+    Each grain count is an index into the palette, so the whole board is drawn by
+    looking up every cell's pre-rendered tile with a single fancy-indexing step and
+    writing the tiles into place in the frame.
+
+    Args:
+        cells: 2-D integer array (or Board) of grain counts.
+        cell_width: The width/height in pixels of each cell.
+        out: Optional preallocated uint8 frame of shape (H, W, 3) to draw into.
+        tiles: Optional tiles from make_cell_tiles(), to avoid rebuilding them for every frame.
+
+    Returns:
+        The frame as a uint8 array of shape (num_rows * cell_width, num_cols * cell_width, 3).
+    """
+    cells = np.asarray(cells)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Can't draw an empty board.")
+    if cell_width <= 0:
+        raise ValueError("Error: cell_width must be positive.")
+
+    num_rows, num_cols = cells.shape
+    shape = (num_rows * cell_width, num_cols * cell_width, 3)
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    elif out.shape != shape or out.dtype != np.uint8:
+        raise ValueError("Error: out must be a uint8 array of shape " + str(shape) + ".")
+    if tiles is None:
+        tiles = make_cell_tiles(cell_width)
+
+    # (row, col, y in cell, x in cell, channel) -> the frame's (row, y, col, x, channel) layout
+    cell_pixels = tiles[np.minimum(cells, PALETTE_SIZE - 1)]
+    out.reshape(num_rows, cell_width, num_cols, cell_width, 3)[:] = cell_pixels.transpose(0, 2, 1, 3, 4)
+    return out
+
 
 def animate_boards(time_points: list[Board], cell_width: int) -> list[np.ndarray]:
-    """Generates a list of images corresponding to drawing each Board on a pygame 
-        surface with the given cell width.
+    """Generates a list of images corresponding to drawing each Board with the
+        given cell width.
     Args:
         time_points: Sequence of boards to render
         cell_width: The width/height in pixels of each cell.
@@ -19,30 +129,232 @@ def animate_boards(time_points: list[Board], cell_width: int) -> list[np.ndarray
     """
     if len(time_points) == 0:
         raise ValueError("Error: no Board objects present in input to animate_boards.")
-    
-    # note each image is a numpy array representation of the pygame surface
-    # used for creating mp4 video later
-    images: list[np.ndarray] = [None] * len(time_points) 
-    
-    # for every board, draw to pygame surface
+
+    # render_board() draws the same pixels as draw_to_image(), so build the cell tiles once
+    tiles = make_cell_tiles(cell_width)
+    images: list[np.ndarray] = [None] * len(time_points)
+
     for i in range(len(time_points)):
-        images[i] = draw_to_image(time_points[i], cell_width)
-        
+        images[i] = render_board(time_points[i], cell_width, tiles=tiles)
+
     return images
 
 
-def process_images_section(timepoints: list[Board], cell_width: int, start_offset: int, out_q: Queue) -> None:
-    """Process a contiguous slice of boards and emit frames into a multiprocessing Queue.
+def write_boards_video(boards: Iterable[Board | np.ndarray], cell_width: int,
+                       video_path: str, fps: int = 10, num_procs: int = 1) -> int:
+    """Draw boards one at a time and append each frame to an mp4 as soon as it is drawn.
+
+    Unlike animate_boards(), this never holds more than a few boards and frames,
+    so it can consume a generator such as serial.stream_sandpiles().
 
     Args:
-        timepoints: The slice of boards to render in this worker.
+        boards: Boards (or 2-D arrays) to render, in order.
         cell_width: The width/height in pixels of each cell.
-        start_offset: Global index offset used to place frames back in order.
-        out_q: Multiprocessing Queue to which (global_index, frame) tuples are sent.
+        video_path: Path of the video to write.
+        fps: Frames per second of the video.
+        num_procs: Number of rendering processes; with more than one, frames come from
+            stream_frames_parallel() and are encoded while later ones are still being drawn.
+
+    Returns:
+        The number of frames written.
+    """
+    if num_procs > 1:
+        frames = stream_frames_parallel(boards, cell_width, num_procs)
+    else:
+        frames = stream_frames(boards, cell_width)
+
+    # draw the first frame before opening the video, so that no input leaves no file behind
+    first_frame = next(frames, None)
+    if first_frame is None:
+        raise ValueError("Error: no Board objects present in input to write_boards_video.")
+
+    writer = imageio.get_writer(video_path, fps=fps, codec="libx264", quality=8)
+    try:
+        writer.append_data(first_frame)
+        num_frames = 1
+        for frame in frames:
+            writer.append_data(frame)
+            num_frames += 1
+    finally:
+        writer.close()
+
+    return num_frames
+
+
+def stream_frames(boards: Iterable[Board | np.ndarray], cell_width: int) -> Iterator[np.ndarray]:
+    """Render boards one at a time, reusing a single frame buffer.
+
+    Args:
+        boards: Boards (or 2-D arrays) to render, in order.
+        cell_width: The width/height in pixels of each cell.
+
+    Yields:
+        The frames; each one is only valid until the next is requested.
     """
-    for i, board in enumerate(timepoints):
-        frame = draw_to_image(board, cell_width)  # np.ndarray (H, W, 3), uint8
-        out_q.put((start_offset + i, frame))
+    tiles = make_cell_tiles(cell_width)
+    frame = None
+    for board in boards:
+        cells = np.asarray(board)
+        if frame is None:
+            frame = np.empty((cells.shape[0] * cell_width, cells.shape[1] * cell_width, 3), dtype=np.uint8)
+        yield render_board(cells, cell_width, frame, tiles)
+
+
+def render_worker(boards_name: str, frames_name: str, boards_shape: tuple[int, int, int],
+                  frames_shape: tuple[int, int, int, int], cell_width: int,
+                  task_q: Queue, done_q: Queue) -> None:
+    """Body of a rendering process: render chunks of board slots into frame slots until told to stop.
+
+    Args:
+        boards_name: Name of the shared memory block of board slots.
+        frames_name: Name of the shared memory block of frame slots.
+        boards_shape: (num_slots, num_rows, num_cols), the shape of the board slots.
+        frames_shape: (num_slots, H, W, 3), the shape of the frame slots.
+        cell_width: The width/height in pixels of each cell.
+        task_q: Queue of (first_slot, count) chunks, with None meaning stop.
+        done_q: Queue receiving first_slot for every finished chunk, or ("error", message).
+    """
+    boards_shm = shared_memory.SharedMemory(name=boards_name)
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    boards = np.ndarray(boards_shape, dtype=np.uint8, buffer=boards_shm.buf)
+    frames = np.ndarray(frames_shape, dtype=np.uint8, buffer=frames_shm.buf)
+    try:
+        tiles = make_cell_tiles(cell_width)
+        while True:
+            task = task_q.get()
+            if task is None:
+                break
+            first_slot, count = task
+            for slot in range(first_slot, first_slot + count):
+                render_board(boards[slot], cell_width, frames[slot], tiles)
+            done_q.put(first_slot)
+    except Exception:
+        done_q.put(("error", traceback.format_exc()))
+    finally:
+        del boards, frames
+        boards_shm.close()
+        frames_shm.close()
+
+
+def stream_frames_parallel(boards: Iterable[Board | np.ndarray], cell_width: int,
+                           num_procs: int | None = None, chunk_size: int = 4) -> Iterator[np.ndarray]:
+    """Render boards with a pool of processes and yield the frames in order as soon as they are ready.
+
+    The boards are handed out in small chunks from a shared task queue, so a worker
+    that finishes early simply takes the next chunk and expensive stretches of the
+    run are spread over all workers. Nothing large is pickled: boards are copied
+    into a ring of shared-memory slots, workers draw each frame into the matching
+    frame slot, and only slot numbers travel through the queues. A slot is refilled
+    with the next board once its frame has been yielded, so memory is bounded by
+    the number of slots, not the number of boards, and encoding can start as soon
+    as the first chunk is done.
+
+    Args:
+        boards: Boards (or 2-D arrays) to render, in order. May be a generator.
+        cell_width: The width/height in pixels of each cell.
+        num_procs: Number of rendering processes; defaults to the number of cores.
+        chunk_size: Number of consecutive boards per task.
+
+    Yields:
+        The frames as fresh uint8 arrays of shape (H, W, 3), which the caller may keep.
+    """
+    if cell_width <= 0:
+        raise ValueError("Error: cell_width must be positive.")
+    if chunk_size <= 0:
+        raise ValueError("Error: chunk_size must be positive.")
+    if num_procs is None:
+        num_procs = os.cpu_count()
+
+    pending = iter(boards)
+    first = next(pending, None)
+    if first is None:
+        return
+    first = np.asarray(first)
+    pending = chain([first], pending)
+
+    num_rows, num_cols = first.shape
+    # twice as many chunks as workers, so that there is work queued while we encode
+    num_chunks = 2 * num_procs
+    boards_shape = (num_chunks * chunk_size, num_rows, num_cols)
+    frames_shape = (num_chunks * chunk_size, num_rows * cell_width, num_cols * cell_width, 3)
+
+    boards_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(boards_shape)))
+    frames_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(frames_shape)))
+    board_slots = np.ndarray(boards_shape, dtype=np.uint8, buffer=boards_shm.buf)
+    frame_slots = np.ndarray(frames_shape, dtype=np.uint8, buffer=frames_shm.buf)
+
+    def fill_chunk(first_slot: int) -> int:
+        # counts past the end of the palette all look the same, so the slots only need uint8
+        count = 0
+        for board in pending:
+            cells = np.asarray(board)
+            if cells.shape != (num_rows, num_cols):
+                raise ValueError("Error: all boards must have the same shape.")
+            np.minimum(cells, PALETTE_SIZE - 1, out=board_slots[first_slot + count], casting="unsafe")
+            count += 1
+            if count == chunk_size:
+                break
+        return count
+
+    task_q = Queue()
+    done_q = Queue()
+    procs: list[Process] = []
+    try:
+        for _ in range(num_procs):
+            p = Process(target=render_worker,
+                        args=(boards_shm.name, frames_shm.name, boards_shape, frames_shape,
+                              cell_width, task_q, done_q))
+            p.start()
+            procs.append(p)
+
+        # chunks in the order their frames have to be yielded
+        in_order: deque[tuple[int, int]] = deque()
+        for chunk in range(num_chunks):
+            count = fill_chunk(chunk * chunk_size)
+            if count == 0:
+                break
+            task_q.put((chunk * chunk_size, count))
+            in_order.append((chunk * chunk_size, count))
+
+        finished: set[int] = set()
+        while len(in_order) > 0:
+            first_slot, count = in_order.popleft()
+
+            # chunks can finish out of order; remember the ones that are early
+            while first_slot not in finished:
+                try:
+                    message = done_q.get(timeout=1.0)
+                except queue.Empty:
+                    # a worker that died without reporting (e.g. killed) would otherwise leave us waiting forever
+                    if not all(p.is_alive() for p in procs):
+                        raise RuntimeError("Error: a rendering process exited unexpectedly.")
+                    continue
+                if isinstance(message, tuple):
+                    raise RuntimeError("Error: a rendering process failed:\n" + message[1])
+                finished.add(message)
+            finished.remove(first_slot)
+
+            for slot in range(first_slot, first_slot + count):
+                # a copy, since the slot is refilled and the shared memory is freed when we finish
+                yield frame_slots[slot].copy()
+
+            # the caller is done with these frames, so the slots can take the next boards
+            count = fill_chunk(first_slot)
+            if count > 0:
+                task_q.put((first_slot, count))
+                in_order.append((first_slot, count))
+    finally:
+        for _ in procs:
+            task_q.put(None)
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        del board_slots, frame_slots
+        boards_shm.close()
+        boards_shm.unlink()
+        frames_shm.close()
+        frames_shm.unlink()
 
 
 def animate_boards_parallel(time_points: list[Board], cell_width: int) -> list[np.ndarray]:
@@ -57,46 +369,8 @@ def animate_boards_parallel(time_points: list[Board], cell_width: int) -> list[n
     """
     if len(time_points) == 0:
         raise ValueError("Error: no Board objects present in input to animate_boards_parallel.")
-    
-    num_procs = os.cpu_count()
-    n = len(time_points)
-
-    images_per_proc = n // num_procs
-    ranges = []
-    start = 0
-    
-    for i in range(num_procs):
-        start = i * images_per_proc
-        end = start + images_per_proc
-        if i == num_procs - 1:
-            end = n  # last takes remaining images
-        
-        ranges.append((start, end))
-
-    out_q = Queue()
-    procs: list[Process] = []
-    for start, end in ranges:
-        board_slice = time_points[start:end]
-        if not board_slice: # just in case
-            continue
-        p = Process(
-            target=process_images_section,
-            args=(board_slice, cell_width, start, out_q),
-        )
-        p.start()
-        procs.append(p)       
-
-    # Collect exactly n frames
-    images_np: list[np.ndarray] = [None] * n
-    for _ in range(n):
-        idx, frame = out_q.get()     # frame is already a new array in the parent
-        images_np[idx] = frame       # no .copy() needed unless you want to duplicate it
-
-    # # Ensure all workers finished (technically don't need this because the loop above waits til n frames are collected, so all processes should be finished when we get here)
-    for p in procs:
-        p.join()
 
-    return images_np
+    return list(stream_frames_parallel(time_points, cell_width))
 
 
 def draw_to_image(b: Board, cell_width: int) -> np.ndarray:
@@ -1,5 +1,6 @@
 """Helper functions for sandpile module."""
 
+import numpy as np
 from datatypes import Board
 
 def contains(b: Board, r: int, c: int) -> bool:
@@ -88,4 +89,36 @@ def make_empty_board(r: int, c: int) -> Board:
         for _ in range(c):
             row.append(0)
         b.append(row)
-    return b
\ No newline at end of file
+    return b
+
+def board_to_array(b: Board) -> np.ndarray:
+    """Convert a board to a 2-D int64 NumPy array.
+
+    Args:
+        b: Board to convert.
+
+    Returns:
+        A new array holding the same grain counts.
+    """
+    assert_rectangular(b)
+    if not b or not b[0]:
+        raise ValueError("Error: board must be non-empty.")
+
+    cells = np.array(b, dtype=np.int64)
+    if cells.min() < 0:
+        raise ValueError("Error: grain counts must be non-negative.")
+    return cells
+
+
+def array_to_board(cells: np.ndarray) -> Board:
+    """Convert a 2-D NumPy array of grain counts back to a board.
+
+    Args:
+        cells: Array to convert.
+
+    Returns:
+        A board (list of lists of Python ints).
+    """
+    if cells.ndim != 2:
+        raise ValueError("Error: expected a 2-D array.")
+    return cells.tolist()
@@ -3,19 +3,65 @@ os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # hide pygame support p
 import sys
 import time
 import imageio
-import pygame
 
-from serial import create_board, simulate_sandpiles
-from parallel import simulate_sandpiles_parallel
-from drawing import animate_boards, animate_boards_parallel
+from serial import create_board, stabilize_array, stream_sandpiles
+from parallel import stabilize_parallel_array
+from helper_functions import board_to_array
+from drawing import render_board, write_boards_video
+
+# number of frames in the video, spread evenly over the topples of the run
+NUM_FRAMES = 200
 
 
 def main() -> None:
     """CLI Call:
-        python3 main.py <board_width> <num_coins> <random|central> <cell_width>
+        python3 main.py <board_width> <num_coins> <random|central> <cell_width> [num_procs]
         try python3 main.py 50 4000 central 10 
         try python3 main.py 300 20000 central 4 # comment serial out
+        give num_procs to also time the parallel engine with that many processes
     """
+    if len(sys.argv) not in (5, 6):
+        raise ValueError("Usage: python3 main.py <board_width> <num_coins> <random|central> <cell_width> [num_procs]")
+
+    board_width = int(sys.argv[1])
+    num_coins = int(sys.argv[2])
+    placement = sys.argv[3]
+    cell_width = int(sys.argv[4])
+    parallel_procs = int(sys.argv[5]) if len(sys.argv) == 6 else None
+
+    if placement not in ("random", "central"):
+        raise ValueError("Error: placement must be random or central.")
+
+    initial_board = create_board(board_width, board_width, num_coins,
+                                 center=(placement == "central"), num_piles=10)
+    cells = board_to_array(initial_board)
+
+    # time the serial approach
+    start_serial = time.time()
+    serial_board, num_gens = stabilize_array(cells)
+    total_serial = time.time() - start_serial
+    print(f"Serial: stable after {num_gens} generations in {total_serial:.3f} seconds.")
+
+    # the parallel engine is only faster with several free cores and large bands, so it is opt-in
+    if parallel_procs is not None:
+        start_parallel = time.time()
+        parallel_board, _ = stabilize_parallel_array(cells, parallel_procs)
+        total_parallel = time.time() - start_parallel
+        print(f"Parallel ({parallel_procs} processes): stable in {total_parallel:.3f} seconds.")
+
+        if not (serial_board == parallel_board).all():
+            raise RuntimeError("Error: serial and parallel boards differ.")
+        print(f"Speedup provided by parallel approach: {total_serial / total_parallel:.2f}")
+
+    # draw the stable board
+    frame = render_board(serial_board, cell_width)
+    imageio.imwrite("sandpile.png", frame)
+    print("Stable board drawn to sandpile.png.")
+
+    # animate the run, drawing sampled generations straight into the video as they are produced
+    num_written = write_boards_video(stream_sandpiles(cells, num_frames=NUM_FRAMES), cell_width, "sandpile.mp4",
+                                     num_procs=os.cpu_count())
+    print(f"Animation of {num_written} frames written to sandpile.mp4.")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,17 @@
 import random
+from collections.abc import Iterator
+import numpy as np
 from datatypes import Board
-from helper_functions import contains, deep_copy_board, num_cols, num_rows, make_empty_board
+from worklist import stabilize_worklist_array
+from helper_functions import (
+    contains,
+    deep_copy_board,
+    num_cols,
+    num_rows,
+    make_empty_board,
+    board_to_array,
+    array_to_board,
+)
 
 def create_board(r: int,
                  c: int,
@@ -46,26 +57,243 @@ def create_board(r: int,
     return b
 
 def simulate_sandpiles(initial_board: Board) -> list[Board]:
-    #TODO: implement
-    pass
+    """Topple a board until it is stable, keeping every generation.
+
+    Args:
+        initial_board: Board to start from (left unchanged).
+
+    Returns:
+        The boards from initial_board through the first stable one.
+    """
+    cells = board_to_array(initial_board)
+
+    boards = [array_to_board(cells)]
+    while not is_stable_array(cells):
+        cells = topple_array(cells)
+        boards.append(array_to_board(cells))
+
+    return boards
+
+
+def stabilize(initial_board: Board) -> Board:
+    """Topple a board until it is stable and return only the stable board.
+
+    Args:
+        initial_board: Board to start from (left unchanged).
+
+    Returns:
+        The stable board.
+    """
+    stable, _ = stabilize_array(board_to_array(initial_board))
+    return array_to_board(stable)
 
 
 def is_converged(b: Board) -> bool:
-    #TODO: implement
-    pass
+    """Return True if no cell of the board holds 4 or more grains.
+
+    Args:
+        b: Board to check.
+
+    Returns:
+        True if the board is stable.
+    """
+    return is_stable_array(board_to_array(b))
 
 
 def update(b: Board) -> Board:
-    #TODO: implement
-    pass
+    """Topple every unstable cell of the board at once, returning the next generation.
+
+    A cell with v grains keeps v % 4 of them and sends v // 4 to each of its four
+    neighbors; grains sent off the edge of the board are lost.
+
+    Args:
+        b: Board to update (left unchanged).
+
+    Returns:
+        The next generation.
+    """
+    return array_to_board(topple_array(board_to_array(b)))
 
 
 def number_of_coins_out(b: Board, r: int, c: int) -> int:
-    #TODO: implement
-    pass
+    """Return the number of grains that cell (r, c) gives away in one update.
+
+    Args:
+        b: Board to query.
+        r: Row index.
+        c: Column index.
+
+    Returns:
+        4 * (b[r][c] // 4): one quarter of the cell's largest multiple of 4 goes to each neighbor.
+    """
+    if not contains(b, r, c):
+        raise ValueError("Error: cell is not on the board.")
+    return 4 * (b[r][c] // 4)
 
 
 def number_of_coins_in(b: Board, r: int, c: int) -> int:
-    #TODO: implement
-    pass
+    """Return the number of grains that cell (r, c) receives from its neighbors in one update.
+
+    Args:
+        b: Board to query.
+        r: Row index.
+        c: Column index.
+
+    Returns:
+        The total that the cell's (up to four) neighbors send to it.
+    """
+    if not contains(b, r, c):
+        raise ValueError("Error: cell is not on the board.")
+
+    total = 0
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        if contains(b, r + dr, c + dc):
+            total += b[r + dr][c + dc] // 4
+    return total
+
+
+def topple_array(cells: np.ndarray) -> np.ndarray:
+    """Array version of update(): topple every unstable cell at once.
+
+    Args:
+        cells: 2-D integer array of grain counts.
+
+    Returns:
+        The next generation as a new array.
+    """
+    given, kept = np.divmod(cells, 4)
+
+    # each cell receives the share given by the cell above, below, left and right of it
+    result = kept
+    result[1:, :] += given[:-1, :]
+    result[:-1, :] += given[1:, :]
+    result[:, 1:] += given[:, :-1]
+    result[:, :-1] += given[:, 1:]
+    return result
+
+
+def is_stable_array(cells: np.ndarray) -> bool:
+    """Array version of is_converged().
+
+    Args:
+        cells: 2-D integer array of grain counts.
+
+    Returns:
+        True if every cell holds fewer than 4 grains.
+    """
+    return bool(cells.max() < 4)
+
+
+def topple_in_place(cells: np.ndarray) -> int:
+    """Advance a board array by one generation in place.
+
+    Only the rows and columns that hold unstable cells, plus a one-cell border
+    that receives their grains, are updated, so a pile spreading out from the
+    center doesn't pay for the empty board around it.
+
+    Args:
+        cells: 2-D integer array of grain counts, updated in place.
+
+    Returns:
+        The number of topples performed, which is 0 if the board was already stable.
+    """
+    unstable = cells >= 4
+    rows = np.flatnonzero(unstable.any(axis=1))
+    if len(rows) == 0:
+        return 0
+    cols = np.flatnonzero(unstable.any(axis=0))
+
+    # the window around the unstable cells; grains leaving it would also leave the board
+    r0, r1 = max(rows[0] - 1, 0), min(rows[-1] + 2, cells.shape[0])
+    c0, c1 = max(cols[0] - 1, 0), min(cols[-1] + 2, cells.shape[1])
+    window = cells[r0:r1, c0:c1]
+    num_topples = int((window // 4).sum())
+    cells[r0:r1, c0:c1] = topple_array(window)
+    return num_topples
+
+
+def stabilize_array(cells: np.ndarray) -> tuple[np.ndarray, int]:
+    """Topple a board array until it is stable.
+
+    Args:
+        cells: 2-D integer array of grain counts (left unchanged).
+
+    Returns:
+        The stable array and the number of generations it took.
+    """
+    cells = np.array(cells, dtype=np.int64)
+    num_gens = 0
+
+    while topple_in_place(cells) > 0:
+        num_gens += 1
+
+    return cells, num_gens
+
+
+def stream_sandpiles(initial_board: Board | np.ndarray, frequency: int | None = None,
+                     num_frames: int | None = None) -> Iterator[np.ndarray]:
+    """Topple a board until it is stable, yielding only sampled generations.
+
+    Unlike simulate_sandpiles(), no more than one generation is held at a time, so
+    memory depends on how many frames the caller keeps rather than on how many
+    generations the run takes.
+
+    Give at most one of frequency and num_frames. The first and the stable
+    generation are always yielded.
+
+    Args:
+        initial_board: Board or 2-D array to start from (left unchanged).
+        frequency: Yield every frequency-th generation (the default is every generation).
+        num_frames: Yield about num_frames generations, evenly spaced by the number of
+            topples performed rather than by generation, since late generations topple
+            far fewer cells than early ones. The total is found with a first, untraced
+            run, so this takes about twice as long.
+
+    Yields:
+        Copies of the sampled generations as int64 arrays.
+    """
+    if frequency is not None and num_frames is not None:
+        raise ValueError("Error: give at most one of frequency and num_frames.")
+    if frequency is None and num_frames is None:
+        frequency = 1
+    if frequency is not None and frequency <= 0:
+        raise ValueError("Error: frequency must be positive.")
+    if num_frames is not None and num_frames < 2:
+        raise ValueError("Error: num_frames must be at least 2.")
+
+    if isinstance(initial_board, np.ndarray):
+        cells = np.array(initial_board, dtype=np.int64)
+    else:
+        cells = board_to_array(initial_board)
+
+    if num_frames is not None:
+        # the total is the same in any toppling order, so the work-list engine can count it
+        _, stats = stabilize_worklist_array(cells)
+        total_topples = stats.total_topples
+
+    yield cells.copy()
+
+    num_gens = 0
+    topples_done = 0
+    next_frame = 1
+    while True:
+        num_topples = topple_in_place(cells)
+        if num_topples == 0:
+            break
+        num_gens += 1
+        topples_done += num_topples
+
+        if frequency is not None:
+            due = num_gens % frequency == 0
+        else:
+            # yield once we have passed the next of num_frames - 1 even steps of the total
+            due = topples_done * (num_frames - 1) >= next_frame * total_topples
+            while topples_done * (num_frames - 1) >= next_frame * total_topples:
+                next_frame += 1
+
+        if due and cells.max() >= 4:
+            yield cells.copy()
 
+    # the stable board is always the last frame
+    if num_gens > 0:
+        yield cells.copy()
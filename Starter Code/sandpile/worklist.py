@@ -0,0 +1,99 @@
+"""Sandpile stabilization that only visits unstable cells.
+
+update() sweeps the whole board every generation, even when only a thin ring of
+cells around a spreading pile can topple. Here we keep a work list (the
+"frontier") of the flat indices of the cells that hold 4 or more grains. In
+each round, every frontier cell topples as many times as it can, and the next
+frontier is found among the neighbors of the cells that just toppled, because
+those are the only cells whose grain counts went up.
+
+Each round topples exactly the cells that update() would topple, so the rounds
+match the generations of the synchronous engine one for one and end at the same
+stable board (by the abelian property, so would any other toppling order). The
+difference is that a round costs time in proportion to the frontier rather
+than to the whole board.
+
+The board is stored with a one-cell border ring that acts as a sink: grains
+toppled onto it have left the board, and it is emptied after every round.
+"""
+
+import numpy as np
+from datatypes import Board, ToppleStats
+from helper_functions import board_to_array, array_to_board
+
+
+def stabilize_worklist_array(cells: np.ndarray) -> tuple[np.ndarray, ToppleStats]:
+    """Topple a board array until it is stable, visiting only unstable cells.
+
+    Args:
+        cells: 2-D integer array of grain counts (left unchanged).
+
+    Returns:
+        The stable array and statistics on the topples it took.
+    """
+    cells = np.asarray(cells)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Error: expected a non-empty 2-D array.")
+    if cells.min() < 0:
+        raise ValueError("Error: grain counts must be non-negative.")
+
+    num_rows, num_cols = cells.shape
+    width = num_cols + 2
+
+    padded = np.zeros((num_rows + 2, width), dtype=np.int64)
+    padded[1:-1, 1:-1] = cells
+    counts = np.zeros(padded.shape, dtype=np.int64)
+
+    # scratch space for removing duplicate indices from the next frontier
+    slot = np.zeros(padded.size, dtype=np.int64)
+
+    flat = padded.reshape(-1)
+    flat_counts = counts.reshape(-1)
+    directions = (-width, width, -1, 1)
+
+    frontier = np.flatnonzero(flat >= 4)
+    num_rounds = 0
+    grains_lost = 0
+
+    while len(frontier) > 0:
+        # every frontier cell topples as many times as it can
+        topples = flat[frontier] // 4
+        flat[frontier] -= 4 * topples
+        flat_counts[frontier] += topples
+
+        # frontier indices are distinct, so so are frontier + d, and += is safe here
+        for d in directions:
+            flat[frontier + d] += topples
+
+        # empty the sink ring
+        grains_lost += int(padded[0].sum() + padded[-1].sum() + padded[1:-1, 0].sum() + padded[1:-1, -1].sum())
+        padded[0] = 0
+        padded[-1] = 0
+        padded[:, 0] = 0
+        padded[:, -1] = 0
+
+        # only cells next to a topple gained grains, so only they can have become unstable
+        candidates = np.concatenate([frontier + d for d in directions])
+        candidates = candidates[flat[candidates] >= 4]
+
+        # drop duplicates without sorting: of all copies of an index, the last write to slot wins
+        position = np.arange(len(candidates))
+        slot[candidates] = position
+        frontier = candidates[slot[candidates] == position]
+        num_rounds += 1
+
+    stats = ToppleStats(counts[1:-1, 1:-1].copy(), num_rounds, grains_lost)
+    return padded[1:-1, 1:-1].copy(), stats
+
+
+def stabilize_worklist(initial_board: Board) -> tuple[Board, ToppleStats]:
+    """Board version of stabilize_worklist_array().
+
+    Args:
+        initial_board: Board to start from (left unchanged).
+
+    Returns:
+        The stable board and statistics on the topples it took.
+    """
+    stable, stats = stabilize_worklist_array(board_to_array(initial_board))
+    return array_to_board(stable), stats